@@ -0,0 +1,200 @@
+"""Benchmark del render de las escenas de cinematica con control de regresiones.
+
+Uso::
+
+    python benchmarks/benchmark.py                       # compara con la linea base
+    python benchmarks/benchmark.py --guardar_linea_base  # la actualiza
+    python benchmarks/benchmark.py -p 480p15 -c Velocidades BarridoLargo
+    python benchmarks/benchmark.py --cache caliente
+
+Cada caso (escena y calidad) se renderiza en un proceso nuevo, sin cache de
+animaciones ni de secciones, con el perfilado de ``perfil.py`` activado. Las
+caches persistentes (TeX, trayectorias, longitudes de arco, ...) se apuntan
+a un directorio temporal con ``FISICANIMADA_CACHE``, para que el resultado
+no dependa de lo que se haya renderizado antes: con ``--cache fria`` (por
+defecto) cada medida empieza con el directorio vacio y con ``--cache
+caliente`` se hace antes una pasada sin medir que lo llena.
+
+Se guardan los fotogramas por segundo, el pico de memoria (RSS) y el tiempo
+de cada animacion, y se compara con ``linea_base.json`` medida con el mismo
+modo de cache: si un caso o una de sus animaciones tarda, o el caso gasta
+memoria, mas de un ``--umbral`` por encima de la linea base el programa
+termina con error.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+CINEMATICA = RAIZ / "cinematica"
+BENCHMARKS = RAIZ / "benchmarks"
+LINEA_BASE = BENCHMARKS / "linea_base.json"
+
+# Calidades fijas: nombre -> letra de calidad de manim
+PRESETS = {"480p15": "l", "1080p60": "h"}
+MODOS_CACHE = ("fria", "caliente")
+# Las animaciones mas cortas que esto son ruido y no se comparan
+MIN_SEGUNDOS_ANIMACION = 0.05
+
+CASOS = [
+    (CINEMATICA / "posicion_desplazamiento_espacio.py", "PosicionDespEspacio"),
+    (CINEMATICA / "velocidades_media_instantanea.py", "Velocidades"),
+    (BENCHMARKS / "escenas_estres.py", "MuchasTrayectorias"),
+    (BENCHMARKS / "escenas_estres.py", "BarridoLargo"),
+    (BENCHMARKS / "escenas_estres.py", "ZoomProfundo"),
+    (BENCHMARKS / "escenas_estres.py", "TirosSimulados"),
+]
+
+
+def medir(ruta, escena, preset):
+    """Renderiza un caso en este proceso y devuelve sus medidas."""
+    sys.path.insert(0, str(CINEMATICA))
+    from render_lote import renderizar
+
+    with tempfile.TemporaryDirectory() as temporal:
+        os.environ["FISICANIMADA_PERFIL"] = temporal
+        opciones = {
+            "media_dir": str(Path(temporal) / "media"),
+            "disable_caching": True,
+            "progress_bar": "none",
+            "verbosity": "WARNING",
+        }
+        inicio = time.perf_counter()
+        renderizar(ruta, escena, PRESETS[preset], opciones)
+        segundos = time.perf_counter() - inicio
+        perfil = json.loads((Path(temporal) / f"{escena}.json").read_text(encoding="utf-8"))
+
+    fotogramas = sum(a["fotogramas"] for a in perfil["animaciones"])
+    return {
+        "segundos": round(segundos, 3),
+        "fotogramas": fotogramas,
+        "fps": round(fotogramas / segundos, 2),
+        # ru_maxrss esta en KiB en Linux
+        "rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "totales": {k: round(v, 3) for k, v in perfil["totales"].items()},
+        "animaciones": [
+            {"indice": a["indice"], "animaciones": a["animaciones"], "segundos": round(a["segundos"], 4)}
+            for a in perfil["animaciones"]
+        ],
+    }
+
+
+def medir_en_subproceso(ruta, escena, preset, cache):
+    # Un proceso nuevo por caso: la memoria y las caches en memoria no se
+    # arrastran de un caso a otro
+    proceso = subprocess.run(
+        [sys.executable, __file__, "--medir", str(ruta), escena, preset],
+        capture_output=True, text=True, env={**os.environ, "FISICANIMADA_CACHE": str(cache)},
+    )
+    if proceso.returncode:
+        sys.stderr.write(proceso.stderr)
+        proceso.check_returncode()
+    return json.loads(proceso.stdout.splitlines()[-1])
+
+
+def medir_caso(ruta, escena, preset, modo, repeticiones):
+    """Mejor medida de ``repeticiones`` con las caches persistentes en el ``modo`` pedido."""
+    medidas = []
+    with tempfile.TemporaryDirectory() as compartida:
+        if modo == "caliente":
+            # Pasada sin medir que llena las caches
+            medir_en_subproceso(ruta, escena, preset, compartida)
+        for _ in range(repeticiones):
+            if modo == "caliente":
+                medidas.append(medir_en_subproceso(ruta, escena, preset, compartida))
+                continue
+            with tempfile.TemporaryDirectory() as vacia:
+                medidas.append(medir_en_subproceso(ruta, escena, preset, vacia))
+    medida = min(medidas, key=lambda m: m["segundos"])
+    medida["cache"] = modo
+    return medida
+
+
+def comparar(resultados, linea_base, umbral):
+    """Lista de regresiones respecto a la linea base."""
+    regresiones = []
+    for clave, medida in resultados.items():
+        base = linea_base.get(clave)
+        if base is None:
+            continue
+        if base.get("cache") != medida["cache"]:
+            print(f"{clave}: la linea base no se midio con cache {medida['cache']}; no se compara")
+            continue
+        for metrica in ("segundos", "rss_mb"):
+            if medida[metrica] > base[metrica] * (1 + umbral):
+                regresiones.append(
+                    f"{clave}: {metrica} {medida[metrica]} > {base[metrica]} (+{umbral:.0%})"
+                )
+        # Animacion a animacion, si la escena no ha cambiado de estructura
+        animaciones_base = {a["indice"]: a for a in base.get("animaciones", [])}
+        for animacion in medida["animaciones"]:
+            anterior = animaciones_base.get(animacion["indice"])
+            if anterior is None or anterior["animaciones"] != animacion["animaciones"]:
+                continue
+            if (
+                animacion["segundos"] >= MIN_SEGUNDOS_ANIMACION
+                and animacion["segundos"] > anterior["segundos"] * (1 + umbral)
+            ):
+                regresiones.append(
+                    f"{clave}: animacion {animacion['indice']} ({', '.join(animacion['animaciones'])}) "
+                    f"{animacion['segundos']} s > {anterior['segundos']} s (+{umbral:.0%})"
+                )
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-p", "--presets", nargs="+", default=list(PRESETS), help="calidades: " + " ".join(PRESETS))
+    parser.add_argument("-c", "--casos", nargs="*", help="escenas a medir (por defecto, todas)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=1, help="repeticiones de cada caso (se queda la mas rapida)")
+    parser.add_argument("--umbral", type=float, default=0.1, help="empeoramiento relativo permitido")
+    parser.add_argument("--cache", choices=MODOS_CACHE, default="fria", help="estado de las caches persistentes al medir")
+    parser.add_argument("--linea_base", default=str(LINEA_BASE), help="fichero JSON de la linea base")
+    parser.add_argument("--guardar_linea_base", action="store_true", help="guardar los resultados como nueva linea base")
+    parser.add_argument("--salida", default="media/benchmark.json", help="fichero JSON con los resultados")
+    parser.add_argument("--medir", nargs=3, metavar=("FICHERO", "ESCENA", "PRESET"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        print(json.dumps(medir(*args.medir)))
+        return 0
+
+    print(f"Cache {args.cache}")
+    resultados = {}
+    for ruta, escena in CASOS:
+        if args.casos and escena not in args.casos:
+            continue
+        for preset in args.presets:
+            medida = medir_caso(ruta, escena, preset, args.cache, args.repeticiones)
+            resultados[f"{escena}@{preset}"] = medida
+            print(f"{escena}@{preset}: {medida['segundos']} s, {medida['fps']} fps, {medida['rss_mb']} MB")
+
+    salida = Path(args.salida)
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+    ruta_base = Path(args.linea_base)
+    if args.guardar_linea_base:
+        linea_base = json.loads(ruta_base.read_text()) if ruta_base.exists() else {}
+        linea_base.update(resultados)
+        ruta_base.write_text(json.dumps(linea_base, indent=2, ensure_ascii=False))
+        print(f"Linea base guardada en {ruta_base}")
+        return 0
+
+    if not ruta_base.exists():
+        print(f"No hay linea base en {ruta_base}; usa --guardar_linea_base")
+        return 0
+    regresiones = comparar(resultados, json.loads(ruta_base.read_text()), args.umbral)
+    for regresion in regresiones:
+        print("REGRESION", regresion)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
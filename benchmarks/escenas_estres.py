@@ -0,0 +1,131 @@
+"""Escenas sinteticas para medir el rendimiento del render.
+
+Exageran lo que hacen las lecciones de ``cinematica``: muchas trayectorias a
+la vez, barridos largos de un ValueTracker con updaters encadenados, zooms
+muy profundos de la camara sobre unos ejes y muchos tiros simulados.
+"""
+from manim import *
+import numpy as np
+
+from escena import EscenaCinematica
+from graficas import sistema_referencia, trazar
+from simulacion import gravedad, simular
+from tex import mathtex
+from trayectorias import Trayectoria
+from vectores import GrupoFlechas
+
+# Numero de trayectorias simultaneas en MuchasTrayectorias
+N_TRAYECTORIAS = 40
+# Numero de tiros y coeficiente de rozamiento (1/s) en TirosSimulados
+N_TIROS = 30
+ROZAMIENTO = 0.3
+
+
+class MuchasTrayectorias(EscenaCinematica):
+
+    def construct(self):
+        sr = sistema_referencia(x_range=(0, 5), y_range=(0, 5))
+        sr_origin = sr.get_origin()
+        self.add(sr)
+
+        t = ValueTracker(0)
+        dots = VGroup()
+        for i in range(N_TRAYECTORIAS):
+            def func(x, k=i):
+                return 2.5 + 2 * np.sin(x + k / N_TRAYECTORIAS * 2 * np.pi) * np.exp(-x / 10)
+
+            color = interpolate_color(BLUE, RED, i / N_TRAYECTORIAS)
+            tray = Trayectoria(sr, func, 0, 5, run_time=8)
+            dot = Dot(tray.punto(0), color=color, radius=0.06)
+            self.anadir_actualizador(dot, tray.actualizador(t), t)
+            dots.add(dot)
+            self.add(trazar(sr, func, x_range=[0, 5], color=color, stroke_width=1))
+
+        # Todos los vectores de posicion se recolocan de una vez
+        vs = GrupoFlechas(sr_origin, [dot.get_center() for dot in dots], stroke_width=1.5, tip_length=0.1)
+        for v, dot in zip(vs, dots):
+            v.set_color(dot.get_color())
+        self.anadir_actualizador(
+            vs, lambda x: x.colocar(sr_origin, [dot.get_center() for dot in dots]), dots
+            )
+        self.add(dots, vs)
+
+        self.play(t.animate.set_value(5), run_time=8, rate_func=linear)
+        self.wait(2)
+
+
+class BarridoLargo(EscenaCinematica):
+
+    def construct(self):
+        sr = sistema_referencia(x_range=(0, 5), y_range=(0, 5))
+        self.add(sr)
+
+        def func(x):
+            return 2.5 + 1.5 * np.sin(3 * x) + 1 / 8 * np.sin(20 * x)
+
+        traj = trazar(sr, func, x_range=[0, 5], color=GREEN_B)
+        p = Dot(sr.c2p(0, func(0)))
+        tracker = ValueTracker(0)
+        tray = Trayectoria(sr, func, 0, 5, run_time=30)
+        q = Dot(tray.punto(0), color=YELLOW)
+        q_text = mathtex(r"Q")
+        seg = Line(p.get_center(), q.get_center(), buff=0, color=YELLOW)
+        self.anadir_actualizador(q, tray.actualizador(tracker), tracker)
+        self.anadir_actualizador(q_text, lambda x: x.next_to(q.get_center(), UP*0.5), q)
+        self.anadir_actualizador(seg, lambda x: x.put_start_and_end_on(p.get_center(), q.get_center()), q)
+        self.add(traj, p, q, q_text, seg)
+
+        # Ida y vuelta con esperas en medio: los updaters quedan parados
+        for valor in (5, 0, 5):
+            self.play(tracker.animate.set_value(valor), run_time=10, rate_func=linear)
+            self.wait(2)
+
+
+class ZoomProfundo(EscenaCinematica):
+
+    def construct(self):
+        sr = sistema_referencia(x_range=(0, 5), y_range=(0, 5))
+
+        def func(x):
+            return 2.5 + 2 * np.sin(2 * x)
+
+        traj = trazar(sr, func, x_range=[0, 5], color=BLUE_B, zoom=100)
+        self.add(sr, traj)
+        self.camera.frame.save_state()
+
+        # Cada vez mas cerca de un punto de la curva
+        for x, ancho in ((1, 0.25), (2.5, 0.05), (4, 0.01)):
+            self.play(
+                self.camera.frame.animate.move_to(sr.c2p(x, func(x))).set(width=sr.width*ancho),
+                run_time=3,
+            )
+            self.wait()
+            self.play(Restore(self.camera.frame), run_time=3)
+
+
+class TirosSimulados(EscenaCinematica):
+
+    def construct(self):
+        sr = sistema_referencia(x_range=(0, 5), y_range=(0, 5))
+        self.add(sr)
+
+        # Tiros desde el origen con distintos angulos y rozamiento con el aire
+        angulos = np.linspace(15, 85, N_TIROS) * DEGREES
+        v0 = 7 * np.stack([np.cos(angulos), np.sin(angulos)], axis=-1)
+
+        def aceleracion(t, r, v):
+            return gravedad() - ROZAMIENTO * v
+
+        duracion = 1.4
+        sim = simular(aceleracion, r0=np.zeros((N_TIROS, 2)), v0=v0, duracion=duracion)
+
+        tiempo = ValueTracker(0)
+        for i, tabla in enumerate(sim.trayectorias(sr)):
+            color = interpolate_color(BLUE, RED, i / N_TIROS)
+            self.add(VMobject(stroke_width=1, color=color).set_points_as_corners(np.asarray(tabla.puntos)))
+            dot = Dot(tabla.punto(0), color=color, radius=0.05)
+            self.anadir_actualizador(dot, tabla.actualizador(tiempo), tiempo)
+            self.add(dot)
+
+        self.play(tiempo.animate.set_value(duracion), run_time=4, rate_func=linear)
+        self.wait()
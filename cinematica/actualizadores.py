@@ -0,0 +1,179 @@
+"""Updaters con dependencias declaradas, que solo se ejecutan cuando hace falta.
+
+Con ``add_updater`` manim ejecuta el updater en cada fotograma y, mientras un
+mobject tenga updaters, lo considera en movimiento y lo vuelve a rasterizar en
+cada fotograma de cada animacion, aunque su ValueTracker lleve tiempo parado.
+Aqui cada updater declara de que mobjects (o ValueTracker) depende::
+
+    self.anadir_actualizador(v_1, lambda x: x.put_start_and_end_on(O, dot1.get_center()), dot1)
+
+Antes de cada ``play``/``wait``, una vez añadidos a la escena los mobjects de
+sus animaciones, se calcula que updaters pueden cambiar algo (los que
+dependen, directa o indirectamente, de un mobject animado) y el resto se
+desconecta durante esa animacion, de modo que sus mobjects pasan a la
+imagen estatica. Ademas, un updater activo no se ejecuta en los fotogramas en
+los que no ha cambiado ninguna de sus entradas.
+
+Cuando muchos mobjects siguen puntos de los mismos ejes movidos por los mismos
+ValueTracker, ``self.grupo_actualizadores(sr, tracker)`` calcula en cada
+fotograma las coordenadas de todos con una sola llamada vectorizada a
+``c2p``::
+
+    grupo = self.grupo_actualizadores(sr, tracker)
+    grupo.mover(q, lambda t: (t, func(t)))
+    grupo.unir(segmento, lambda t: ([1, t], [3, func(t)]))
+"""
+from manim import ORIGIN, Scene
+import numpy as np
+
+from trayectorias import c2p_lote
+
+
+class Actualizador:
+    """Updater que solo llama a ``func`` si han cambiado sus entradas."""
+
+    def __init__(self, func, entradas):
+        self.func = func
+        self.entradas = tuple(entradas)
+        self.firma_entradas = None
+        self.firma_mob = None
+
+    @staticmethod
+    def calcular_firma(mobs):
+        # Un ValueTracker guarda su valor en los puntos
+        return [m.points.tobytes() for mob in mobs for m in mob.get_family()]
+
+    def __call__(self, mob):
+        # Se comprueban tambien los puntos del propio mobject, por si otra
+        # animacion lo ha movido
+        entradas = self.calcular_firma(self.entradas)
+        if entradas == self.firma_entradas and self.calcular_firma((mob,)) == self.firma_mob:
+            return
+        self.func(mob)
+        # func solo cambia el mobject: las entradas ya estan firmadas
+        self.firma_entradas = entradas
+        self.firma_mob = self.calcular_firma((mob,))
+
+
+class GrupoActualizadores:
+    """Coordenadas sobre los ejes ``sr`` que dependen de los valores de ``trackers``.
+
+    Cada mobject registra una funcion que recibe los valores de los trackers y
+    devuelve las coordenadas ``(xs, ys)`` de uno o varios puntos. En cada
+    fotograma, el primer updater del grupo que se ejecuta evalua todas las
+    funciones y pasa todos los puntos a la escena de una vez; el resto solo
+    leen su parte.
+    """
+
+    def __init__(self, escena, sr, *trackers):
+        self.escena = escena
+        self.sr = sr
+        self.trackers = trackers
+        self.funciones = []
+        self.valores = None
+        self.puntos = None
+
+    def registrar(self, coordenadas):
+        self.funciones.append(coordenadas)
+        self.puntos = None
+        return len(self.funciones) - 1
+
+    def calcular(self):
+        valores = tuple(tracker.get_value() for tracker in self.trackers)
+        if self.puntos is None or valores != self.valores:
+            xs, ys = [], []
+            for funcion in self.funciones:
+                x, y = np.broadcast_arrays(*(np.atleast_1d(c).astype(float) for c in funcion(*valores)))
+                xs.append(x)
+                ys.append(y)
+            puntos = c2p_lote(self.sr, np.concatenate(xs), np.concatenate(ys))
+            self.puntos = np.split(puntos, np.cumsum([len(x) for x in xs])[:-1])
+            self.valores = valores
+        return self.puntos
+
+    def mover(self, mob, coordenadas, desplazamiento=ORIGIN):
+        """Coloca ``mob`` (o cada submobject, si hay un punto para cada uno) en ``coordenadas``."""
+        indice = self.registrar(coordenadas)
+
+        def actualizar(m):
+            destinos = self.calcular()[indice] + desplazamiento
+            if len(destinos) == 1:
+                m.move_to(destinos[0])
+            else:
+                for sub, destino in zip(m.submobjects, destinos):
+                    sub.move_to(destino)
+
+        return self.escena.anadir_actualizador(mob, actualizar, *self.trackers)
+
+    def unir(self, mob, coordenadas):
+        """Coloca la linea o flecha ``mob`` entre los dos puntos de ``coordenadas``."""
+        indice = self.registrar(coordenadas)
+        return self.escena.anadir_actualizador(
+            mob, lambda m: m.put_start_and_end_on(*self.calcular()[indice]), *self.trackers
+        )
+
+
+class PlanificadorActualizadores(Scene):
+    """Mixin de escena que desconecta los updaters inactivos en cada animacion."""
+
+    def anadir_actualizador(self, mob, func, *entradas):
+        """Como ``mob.add_updater(func)``, indicando los mobjects que lee ``func``."""
+        actualizador = Actualizador(func, entradas)
+        mob.add_updater(actualizador)
+        return actualizador
+
+    def grupo_actualizadores(self, sr, *trackers):
+        """``GrupoActualizadores`` para mobjects que siguen a ``trackers`` sobre ``sr``."""
+        return GrupoActualizadores(self, sr, *trackers)
+
+    def actualizadores_activos(self, animaciones):
+        """Updaters declarados que pueden cambiar algo durante ``animaciones``."""
+        familias = self.get_mobject_family_members()
+        declarados = [
+            (mob, func) for mob in familias for func in mob.updaters
+            if isinstance(func, Actualizador)
+        ]
+        # Lo que mueve alguna animacion o un updater normal puede cambiar en
+        # cualquier fotograma
+        moviles = {id(m) for animacion in animaciones for m in animacion.mobject.get_family()}
+        for mob in familias:
+            if any(not isinstance(func, Actualizador) for func in mob.updaters):
+                moviles.update(id(m) for m in mob.get_family())
+
+        activos = set()
+        cambio = True
+        while cambio:
+            cambio = False
+            for mob, func in declarados:
+                if id(func) in activos:
+                    continue
+                if any(id(m) in moviles for entrada in func.entradas for m in entrada.get_family()):
+                    activos.add(id(func))
+                    moviles.update(id(m) for m in mob.get_family())
+                    cambio = True
+        return activos
+
+    def add_mobjects_from_animations(self, animaciones):
+        # Despues de añadir los mobjects de las animaciones, para que los
+        # nuevos y los que dependen de ellos cuenten como en movimiento, y
+        # antes de que manim separe los mobjects estaticos
+        super().add_mobjects_from_animations(animaciones)
+        activos = self.actualizadores_activos(animaciones)
+        self._dormidos = getattr(self, "_dormidos", [])
+        for mob in self.get_mobject_family_members():
+            inactivos = [
+                func for func in mob.updaters
+                if isinstance(func, Actualizador) and id(func) not in activos
+            ]
+            if inactivos:
+                self._dormidos.append((mob, mob.updaters))
+                mob.updaters = [func for func in mob.updaters if func not in inactivos]
+
+    def play(self, *args, **kwargs):
+        try:
+            super().play(*args, **kwargs)
+        finally:
+            # Volvemos a conectar los updaters para la siguiente animacion
+            for mob, updaters in reversed(getattr(self, "_dormidos", [])):
+                mob.updaters = updaters
+            self._dormidos = []
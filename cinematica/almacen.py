@@ -0,0 +1,48 @@
+"""Almacen en disco de arrays precalculados que se abren con ``mmap``.
+
+Cuando se renderizan muchas lecciones o variantes en paralelo, cada proceso
+calculaba y guardaba en su memoria sus propias tablas de posiciones y
+tangentes. ``obtener(tipo, clave, calcular)`` guarda el resultado de
+``calcular()`` como ``.npy`` en la cache la primera vez y despues lo abre en
+modo solo lectura con ``mmap``: todos los procesos comparten las mismas
+paginas del sistema operativo y la memoria no crece con el numero de workers.
+
+Los ficheros se escriben en un temporal y se renombran, asi que un lector
+nunca ve un array a medio escribir. Las claves incluyen ``VERSION``, que se
+sube si cambia el contenido que se guarda, y las huellas de las funciones,
+que cambian si se modifica la trayectoria.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from cache import directorio_cache, huella
+
+VERSION = 1
+
+
+def clave(*partes):
+    """Clave del almacen para los valores ``partes``."""
+    return huella(VERSION, *partes)
+
+
+def obtener(tipo, clave, calcular):
+    """Array de ``tipo`` y ``clave``, calculado con ``calcular()`` si no esta guardado.
+
+    Con ``clave=None`` (datos sin huella estable) se calcula sin guardarlo.
+    """
+    if clave is None:
+        return np.ascontiguousarray(calcular())
+    ruta = directorio_cache("almacen", tipo) / f"{clave}.npy"
+    try:
+        return np.load(ruta, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    datos = np.ascontiguousarray(calcular())
+    fd, temporal = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, datos)
+    os.replace(temporal, ruta)
+    return np.load(ruta, mmap_mode="r")
@@ -0,0 +1,123 @@
+"""Utilidades comunes para las caches en disco de las escenas.
+
+Todas las caches cuelgan de un mismo directorio, que por defecto es
+``~/.cache/fisicanimada`` y se puede cambiar con la variable de entorno
+``FISICANIMADA_CACHE`` (por ejemplo, para compartirlo entre maquinas).
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import tempfile
+import textwrap
+from pathlib import Path
+
+import numpy as np
+
+# Los repr por defecto incluyen la direccion en memoria, que cambia en cada proceso
+_DIRECCION = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class SinHuella(ValueError):
+    """Valor sin una huella que se mantenga de un proceso a otro."""
+
+
+def directorio_cache(*partes):
+    base = os.environ.get("FISICANIMADA_CACHE", Path.home() / ".cache" / "fisicanimada")
+    ruta = Path(base).joinpath(*partes)
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def huella(*partes):
+    """Hash estable de una serie de valores (se usa su ``repr``)."""
+    return hashlib.sha256(repr(partes).encode("utf-8")).hexdigest()
+
+
+def huella_valor(valor, _vistas=frozenset()):
+    """Hash estable de un valor capturado por una funcion.
+
+    Los arrays se identifican por su contenido completo (su ``repr`` recorta
+    los arrays grandes) y las funciones por su ``huella_funcion``. Lanza
+    ``SinHuella`` si el valor solo se puede describir por su direccion en
+    memoria.
+    """
+    if isinstance(valor, np.ndarray):
+        if valor.dtype == object:
+            raise SinHuella("array de objetos")
+        return huella("ndarray", str(valor.dtype), valor.shape, hashlib.sha256(valor.tobytes()).hexdigest())
+    if isinstance(valor, functools.partial) or inspect.ismethod(valor) or hasattr(valor, "__code__"):
+        return huella_funcion(valor, _vistas)
+    if isinstance(valor, (list, tuple)):
+        return huella(type(valor).__name__, [huella_valor(v, _vistas) for v in valor])
+    if isinstance(valor, dict):
+        return huella("dict", sorted((repr(k), huella_valor(v, _vistas)) for k, v in valor.items()))
+    texto = repr(valor)
+    if _DIRECCION.search(texto):
+        raise SinHuella(texto)
+    return texto
+
+
+def huella_funcion(func, _vistas=frozenset()):
+    """Hash del codigo fuente de ``func`` y de los valores que captura.
+
+    Si cambia la definicion de la trayectoria cambia la huella y las
+    entradas antiguas de la cache dejan de usarse. Lanza ``SinHuella`` si
+    ``func`` depende de valores sin huella estable (como un mobject); en ese
+    caso no se debe guardar nada en las caches de disco.
+    """
+    if id(func) in _vistas:
+        # Funcion recursiva que se captura a si misma
+        return "recursiva"
+    _vistas = _vistas | {id(func)}
+    if isinstance(func, functools.partial):
+        return huella(
+            huella_funcion(func.func, _vistas), huella_valor(func.args, _vistas),
+            huella_valor(func.keywords, _vistas),
+        )
+    if inspect.ismethod(func):
+        return huella(huella_valor(func.__self__, _vistas), huella_funcion(func.__func__, _vistas))
+    if not hasattr(func, "__code__"):
+        # Funciones de C (np.sin, math.cos, ...) y objetos invocables
+        return huella_valor(func, _vistas)
+    try:
+        fuente = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        # Funciones sin fuente disponible (creadas con exec, lambdify, ...)
+        codigo = func.__code__
+        fuente = repr((codigo.co_code, codigo.co_consts, codigo.co_names))
+    # Los valores por defecto y las variables capturadas tambien cuentan: la
+    # misma funcion definida dentro de un bucle da trayectorias distintas
+    capturadas = []
+    for celda in func.__closure__ or ():
+        try:
+            contenido = celda.cell_contents
+        except ValueError:
+            # Celda vacia
+            capturadas.append(None)
+            continue
+        capturadas.append(huella_valor(contenido, _vistas))
+    return huella(
+        fuente, huella_valor(func.__defaults__, _vistas),
+        huella_valor(func.__kwdefaults__, _vistas), capturadas,
+    )
+
+
+def leer_json(ruta):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def escribir_json(ruta, datos):
+    # Escribimos en un temporal y lo renombramos para que otro proceso
+    # nunca lea un fichero a medio escribir
+    ruta = Path(ruta)
+    fd, temporal = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2)
+    os.replace(temporal, ruta)
@@ -0,0 +1,66 @@
+"""Camara movil que solo rasteriza lo que cae dentro del encuadre.
+
+``MovingCamera`` manda a cairo todos los mobjects de la escena en cada
+fotograma, aunque la camara este mirando las formulas a veinte unidades de los
+ejes. ``CamaraRecortada`` descarta antes de rasterizar los mobjects cuya caja
+(ampliada con el grosor del trazo) queda completamente fuera del encuadre
+actual, y dibuja como poligonos sencillos los que ocupan solo unos pocos
+pixeles porque la camara esta muy alejada.
+"""
+from manim import MovingCamera, VMobject
+import numpy as np
+
+# Por debajo de este tamano en pixeles las curvas se dibujan como poligonos
+DETALLE_PX = 4
+# Vertices maximos de cada subtrayecto simplificado
+MAX_VERTICES = 8
+
+
+class CamaraRecortada(MovingCamera):
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = super().get_mobjects_to_display(*args, **kwargs)
+        centro = self.frame_center[:2]
+        mitad = np.array([self.frame_width, self.frame_height]) / 2
+        return [m for m in mobjects if self.en_cuadro(m, centro - mitad, centro + mitad)]
+
+    def margen(self, mob):
+        """Lo que sobresale el trazo de los puntos del mobject, en unidades de la escena."""
+        if not isinstance(mob, VMobject):
+            return 0
+        ancho = max(mob.get_stroke_width(), mob.get_stroke_width(background=True))
+        return ancho * self.cairo_line_width_multiple
+
+    def en_cuadro(self, mob, esquina_inferior, esquina_superior):
+        puntos = mob.points[:, :2]
+        if len(puntos) == 0:
+            return True
+        margen = self.margen(mob)
+        return bool(
+            np.all(puntos.max(axis=0) + margen >= esquina_inferior)
+            and np.all(puntos.min(axis=0) - margen <= esquina_superior)
+        )
+
+    def tamano_px(self, puntos):
+        tamano = np.ptp(puntos[:, :2], axis=0).max()
+        return tamano * self.pixel_width / self.frame_width
+
+    def set_cairo_context_path(self, ctx, vmobject):
+        n = vmobject.n_points_per_cubic_curve
+        if len(vmobject.points) <= n or self.tamano_px(vmobject.points) > DETALLE_PX:
+            return super().set_cairo_context_path(ctx, vmobject)
+
+        # A este tamano no se distinguen las curvas: unimos algunos anclajes
+        puntos = self.transform_points_pre_display(vmobject, vmobject.points)
+        ctx.new_path()
+        for subpath in vmobject.gen_subpaths_from_points_2d(puntos):
+            anclajes = np.vstack([subpath[::n], subpath[-1:]])
+            paso = max(1, len(anclajes) // MAX_VERTICES)
+            anclajes = np.vstack([anclajes[:-1:paso], anclajes[-1:]])
+            ctx.new_sub_path()
+            ctx.move_to(*anclajes[0][:2])
+            for punto in anclajes[1:]:
+                ctx.line_to(*punto[:2])
+            if vmobject.consider_points_equals_2d(subpath[0], subpath[-1]):
+                ctx.close_path()
+        return self
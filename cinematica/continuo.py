@@ -0,0 +1,117 @@
+"""Codificacion continua: un ffmpeg por seccion en lugar de uno por animacion.
+
+manim abre un ffmpeg para cada ``self.play`` y ``self.wait``, escribe un video
+parcial por cada uno y al final los concatena. Con la variable de entorno
+``FISICANIMADA_STREAMING=1`` los fotogramas pasan por una cola acotada a un
+unico ffmpeg que codifica en otro hilo mientras se rasteriza el fotograma
+siguiente::
+
+    FISICANIMADA_STREAMING=1 manim -qh cinematica/velocidades_media_instantanea.py Velocidades
+
+Solo se corta el video al empezar una seccion nueva (``self.seccion``), para
+que la cache de secciones pueda guardar el video de cada una; al final se
+concatenan unos pocos ficheros en lugar de uno por animacion. Mientras esta
+activa se desactiva la cache de animaciones de manim, que necesita los
+parciales.
+"""
+import os
+from pathlib import Path
+
+from manim import Scene, config
+
+from salidas import FORMATOS, Codificador
+
+
+def streaming_activo():
+    return os.environ.get("FISICANIMADA_STREAMING", "") not in ("", "0")
+
+
+class CodificacionContinua(Scene):
+    """Mixin de escena que escribe cada seccion con un solo ffmpeg."""
+
+    def render(self, *args, **kwargs):
+        escritor = self.renderer.file_writer
+        formato = config.movie_file_extension.lstrip(".")
+        if (
+            not streaming_activo()
+            or not hasattr(escritor, "partial_movie_directory")
+            or config.renderer != "cairo"
+            or config.transparent
+            or formato not in FORMATOS
+        ):
+            return super().render(*args, **kwargs)
+
+        self._formato = formato
+        # (seccion de manim, video) de cada tramo escrito, en orden
+        self._tramos = []
+        self._codificador = None
+        escritor.begin_animation = self.empezar_animacion
+        escritor.end_animation = lambda allow_write=False: None
+        escritor.write_frame = self.escribir_fotograma
+        cache = config.disable_caching
+        config.disable_caching = True
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            config.disable_caching = cache
+            # Si el render fallo, el tramo a medias no se guarda
+            if self._codificador is not None:
+                try:
+                    self._codificador.cerrar()
+                finally:
+                    Path(self._codificador.salida).unlink(missing_ok=True)
+
+    def video_seccion(self, seccion):
+        """Video en el que guardar ``seccion``, o None para un fichero temporal."""
+        return None
+
+    def empezar_animacion(self, allow_write=False, file_path=None):
+        if allow_write:
+            self.abrir_tramo()
+
+    def abrir_tramo(self):
+        escritor = self.renderer.file_writer
+        seccion = escritor.sections[-1]
+        if self._tramos and self._tramos[-1][0] is seccion:
+            return
+        self.cerrar_tramo()
+        video = self.video_seccion(seccion)
+        if video is None:
+            video = Path(escritor.partial_movie_directory) / (
+                f"continuo_{len(escritor.sections) - 1:04}{config.movie_file_extension}"
+            )
+        video = Path(video)
+        self._tramos.append((seccion, video))
+        self._codificador = Codificador(
+            video.with_name(f"{video.stem}.tmp{video.suffix}"), config.pixel_height, self._formato,
+            config.pixel_width, config.pixel_height, config.frame_rate,
+        )
+
+    def cerrar_tramo(self):
+        if self._codificador is None:
+            return
+        codificador, self._codificador = self._codificador, None
+        try:
+            codificador.cerrar()
+        except RuntimeError:
+            Path(codificador.salida).unlink(missing_ok=True)
+            raise
+        os.replace(codificador.salida, self._tramos[-1][1])
+
+    def escribir_fotograma(self, frame):
+        if self._codificador is None:
+            self.abrir_tramo()
+        self._codificador.enviar(frame.tobytes())
+
+    def tear_down(self):
+        super().tear_down()
+        if not hasattr(self, "_tramos"):
+            return
+        self.cerrar_tramo()
+        # Cada seccion queda con un unico "parcial", su tramo, que es lo que
+        # manim (y la cache de secciones) concatena al terminar
+        escritor = self.renderer.file_writer
+        tramos = {id(seccion): str(video) for seccion, video in self._tramos}
+        for seccion in escritor.sections:
+            seccion.partial_movie_files = [tramos[id(seccion)]] if id(seccion) in tramos else []
+        escritor.partial_movie_files = [str(video) for _, video in self._tramos]
@@ -0,0 +1,174 @@
+"""Escena base de las lecciones de cinematica.
+
+Ademas de preparar la camara movil y los vectores (``MovingCameraScene`` y
+``VectorScene``), permite dividir ``construct`` en secciones pedagogicas con
+nombre::
+
+    self.seccion("sistema de referencia")
+    ...
+    self.seccion("trayectorias")
+
+Cada seccion tiene una huella calculada a partir de su codigo, del de las
+secciones anteriores y del resto de modulos propios que usa la escena. El
+video de cada seccion se guarda y, en el siguiente render, las secciones cuya
+huella no ha cambiado se ejecutan sin rasterizar y se reutiliza su video.
+Al cambiar una seccion se vuelven a renderizar ella y todas las siguientes.
+
+El resto viene de los mixins y de la camara, documentados en su modulo:
+
+- ``PlanificadorActualizadores`` (``actualizadores.py``)
+- ``PerfilRender`` (``perfil.py``)
+- ``SalidasMultiples`` (``salidas.py``)
+- ``CodificacionContinua`` (``continuo.py``)
+- ``ExportacionVectorial`` (``exportar_vectorial.py``)
+- ``CamaraRecortada`` (``camara.py``)
+"""
+import ast
+import inspect
+import os
+import textwrap
+from pathlib import Path
+
+from manim import MovingCameraScene, VectorScene, __version__, config
+
+from actualizadores import PlanificadorActualizadores
+from cache import huella
+from camara import CamaraRecortada
+from continuo import CodificacionContinua
+from exportar_vectorial import ExportacionVectorial, directorio_vectorial
+from perfil import PerfilRender
+from salidas import SalidasMultiples, salidas_pedidas
+
+
+def fuentes_locales(modulo, vistos=None):
+    """Ficheros del mismo directorio que ``modulo`` usa, directa o indirectamente."""
+    vistos = set() if vistos is None else vistos
+    directorio = Path(modulo.__file__).resolve().parent
+    for valor in list(vars(modulo).values()):
+        dependencia = valor if inspect.ismodule(valor) else inspect.getmodule(valor)
+        fichero = getattr(dependencia, "__file__", None)
+        if fichero is None or Path(fichero).resolve().parent != directorio:
+            continue
+        if fichero not in vistos:
+            vistos.add(fichero)
+            fuentes_locales(dependencia, vistos)
+    return vistos
+
+
+class EscenaCinematica(
+    ExportacionVectorial, CodificacionContinua, PerfilRender, SalidasMultiples, PlanificadorActualizadores,
+    MovingCameraScene, VectorScene,
+):
+
+    def __init__(self, camera_class=CamaraRecortada, **kwargs):
+        super().__init__(camera_class=camera_class, **kwargs)
+
+    def setup(self):
+        MovingCameraScene.setup(self)
+        VectorScene.setup(self)
+        self.secciones = []
+
+    def seccion(self, nombre):
+        """Empieza una nueva seccion de la escena."""
+        if not self.secciones:
+            self._huellas = self.calcular_huellas()
+        escritor = self.renderer.file_writer
+        video = None
+        if self.cache_secciones_activa():
+            directorio = Path(escritor.movie_file_path).parent / "secciones_cache" / str(self)
+            directorio.mkdir(parents=True, exist_ok=True)
+            video = directorio / f"{self._huellas[len(self.secciones)]}{config.movie_file_extension}"
+        cacheada = video is not None and video.exists()
+        self.next_section(nombre, skip_animations=cacheada)
+        self.secciones.append((escritor.sections[-1], nombre, video, cacheada))
+
+    def cache_secciones_activa(self):
+        # Si solo se renderiza un rango de animaciones (manim -n o un render
+        # troceado) las secciones quedan incompletas y no se pueden guardar.
+        # Con salidas extra o exportando hay que recorrer todos los fotogramas
+        escritor = self.renderer.file_writer
+        return (
+            hasattr(escritor, "partial_movie_directory")
+            and not config.from_animation_number
+            and config.upto_animation_number == float("inf")
+            and not salidas_pedidas()
+            and directorio_vectorial() is None
+        )
+
+    def video_seccion(self, seccion):
+        # Con codificacion continua la seccion se escribe directamente en la cache
+        for propia, _, video, cacheada in self.secciones:
+            if propia is seccion and not cacheada:
+                return video
+        return None
+
+    def trozos_secciones(self):
+        """Codigo anterior a la primera seccion y codigo de cada seccion."""
+        lineas, _ = inspect.getsourcelines(type(self).construct)
+        arbol = ast.parse(textwrap.dedent("".join(lineas)))
+        cortes = sorted(
+            nodo.lineno - 1 for nodo in ast.walk(arbol)
+            if isinstance(nodo, ast.Call)
+            and isinstance(nodo.func, ast.Attribute)
+            and nodo.func.attr == "seccion"
+        )
+        return "".join(lineas[:cortes[0] if cortes else None]), [
+            "".join(lineas[inicio:fin]) for inicio, fin in zip(cortes, cortes[1:] + [None])
+        ]
+
+    def calcular_huellas(self):
+        """Huella encadenada de cada seccion de ``construct``."""
+        cabecera, trozos = self.trozos_secciones()
+
+        # Todo lo que no es construct afecta a todas las secciones: el resto
+        # del fichero, los modulos propios que importa y la calidad del video
+        modulo = inspect.getmodule(type(self))
+        fuente_modulo = Path(modulo.__file__).read_text(encoding="utf-8")
+        fuente_modulo = fuente_modulo.replace(inspect.getsource(type(self).construct), "")
+        dependencias = [
+            Path(fichero).read_text(encoding="utf-8")
+            for fichero in sorted(fuentes_locales(modulo))
+            if os.path.abspath(fichero) != os.path.abspath(modulo.__file__)
+        ]
+        anterior = huella(
+            __version__, str(self), fuente_modulo, dependencias,
+            config.pixel_width, config.pixel_height, config.frame_rate,
+            str(config.background_color), cabecera,
+        )
+
+        huellas = []
+        for trozo in trozos:
+            anterior = huella(anterior, trozo)
+            huellas.append(anterior)
+        return huellas
+
+    def tear_down(self):
+        super().tear_down()
+        if self.secciones and self.cache_secciones_activa():
+            self.guardar_secciones()
+
+    def guardar_secciones(self):
+        # Guardamos el video de las secciones renderizadas y sustituimos la
+        # lista de ficheros parciales por los videos de cada seccion, que es
+        # lo que manim concatena al terminar
+        escritor = self.renderer.file_writer
+        propias = {id(s): (video, cacheada) for s, _, video, cacheada in self.secciones}
+        videos = []
+        for seccion in escritor.sections:
+            parciales = seccion.get_clean_partial_movie_files()
+            if id(seccion) not in propias:
+                videos += parciales
+                continue
+            video, cacheada = propias[id(seccion)]
+            if not cacheada:
+                if not parciales:
+                    continue
+                if parciales == [str(video)]:
+                    # Ya escrito por la codificacion continua
+                    videos.append(str(video))
+                    continue
+                temporal = video.with_name(f"{video.stem}.tmp{video.suffix}")
+                escritor.combine_files(parciales, str(temporal))
+                os.replace(temporal, video)
+            videos.append(str(video))
+        escritor.partial_movie_files = videos
@@ -0,0 +1,335 @@
+"""Exportacion de escenas como linea de tiempo vectorial para verla en el navegador.
+
+Se activa con la variable de entorno ``FISICANIMADA_VECTORIAL``, que indica el
+directorio de salida::
+
+    FISICANIMADA_VECTORIAL=vectorial manim -ql cinematica/velocidades_media_instantanea.py Velocidades
+
+En lugar de rasterizar y codificar, en cada fotograma se anota que mobjects
+se ven y como estan colocados. La forma de cada mobject (sus puntos de Bezier
+y sus colores) se guarda una sola vez; en cada fotograma solo se guarda la
+transformacion afin que la lleva a su posicion actual, las opacidades, el
+grosor del trazo y el orden de dibujo, ademas del encuadre de la camara. Si
+un mobject cambia de forma (``Create``, ``Transform``, ...) se guarda la
+nueva forma.
+
+Las columnas de cada fotograma se guardan en float32 como diferencias con el
+fotograma anterior, de modo que lo que no se mueve son ceros y se comprime
+casi por completo. El resultado es ``<Escena>.html``, que lleva los datos
+dentro y dibuja la escena con un canvas a la resolucion de la pantalla.
+
+No se combina con ``FISICANIMADA_SALIDAS`` ni con ``FISICANIMADA_STREAMING``,
+que necesitan los fotogramas rasterizados, y mientras se exporta se desactiva
+la cache de secciones.
+"""
+import base64
+import gzip
+import json
+import os
+from pathlib import Path
+
+from manim import Camera, Scene, VMobject, config
+from manim.utils.iterables import list_update
+import numpy as np
+
+# Columnas de cada mobject en cada fotograma: forma (-1 si no se ve), matriz
+# afin (x' = a x + b y + tx, y' = c x + d y + ty), opacidades, grosor y orden
+CAMPOS = ("forma", "a", "b", "c", "d", "tx", "ty", "opacidad_trazo", "opacidad_relleno", "grosor", "orden")
+# Error maximo (en unidades de la escena) para dar por buena la transformacion
+TOLERANCIA = 1e-3
+
+
+def directorio_vectorial():
+    ruta = os.environ.get("FISICANIMADA_VECTORIAL")
+    return Path(ruta) if ruta else None
+
+
+def _hex(rgba):
+    return "#" + "".join(f"{round(255 * c):02x}" for c in np.clip(rgba[:3], 0, 1))
+
+
+def ajustar_afin(origen, destino):
+    """Transformacion afin ``(a, b, c, d, tx, ty)`` de ``origen`` a ``destino``, o None."""
+    if np.array_equal(origen, destino):
+        return (1, 0, 0, 1, 0, 0)
+    t = destino[0] - origen[0]
+    if np.abs(destino - origen - t).max() <= TOLERANCIA:
+        return (1, 0, 0, 1, *t)
+    unos = np.ones((len(origen), 1))
+    matriz, *_ = np.linalg.lstsq(np.hstack([origen, unos]), destino, rcond=None)
+    if np.abs(np.hstack([origen, unos]) @ matriz - destino).max() > TOLERANCIA:
+        return None
+    (a, c), (b, d), (tx, ty) = matriz
+    return (a, b, c, d, tx, ty)
+
+
+def codificar_deltas(tabla):
+    """Diferencias en float32 entre filas consecutivas de ``tabla``.
+
+    Cada diferencia se toma respecto a la fila ya reconstruida, asi que los
+    errores de redondeo no se acumulan al sumarlas en el reproductor.
+    """
+    deltas = np.empty(tabla.shape, dtype=np.float32)
+    anterior = np.zeros(tabla.shape[1])
+    for i, fila in enumerate(tabla):
+        deltas[i] = fila - anterior
+        anterior = anterior + deltas[i]
+    return deltas
+
+
+class ExportacionVectorial(Scene):
+    """Mixin de escena que exporta la linea de tiempo si ``FISICANIMADA_VECTORIAL`` esta definida."""
+
+    def render(self, *args, **kwargs):
+        directorio = directorio_vectorial()
+        if directorio is None:
+            return super().render(*args, **kwargs)
+        if os.environ.get("FISICANIMADA_SALIDAS") or os.environ.get("FISICANIMADA_STREAMING"):
+            raise RuntimeError("FISICANIMADA_VECTORIAL no se combina con salidas extra ni streaming")
+
+        # id del mobject -> (pista, mobject, forma, puntos de la forma)
+        self._pistas = {}
+        self._formas = []
+        self._indices_formas = {}
+        self._fotogramas = []
+        self._camara = []
+
+        # Nada se rasteriza ni se manda a ffmpeg; add_frame sigue llevando la
+        # cuenta del tiempo
+        renderer = self.renderer
+        escritor = renderer.file_writer
+        renderer.update_frame = lambda *args, **kwargs: None
+        renderer.get_frame = lambda: None
+        add_frame = renderer.add_frame
+
+        def add_frame_vectorial(frame, num_frames=1):
+            if not renderer.skip_animations:
+                fila = self.capturar()
+                self._fotogramas += [fila] * num_frames
+                self._camara += [self.encuadre()] * num_frames
+            return add_frame(frame, num_frames)
+
+        renderer.add_frame = add_frame_vectorial
+        for metodo in ("begin_animation", "end_animation", "write_frame", "finish"):
+            setattr(escritor, metodo, lambda *args, **kwargs: None)
+        cache = config.disable_caching
+        config.disable_caching = True
+        try:
+            resultado = super().render(*args, **kwargs)
+        finally:
+            config.disable_caching = cache
+        self.guardar_vectorial(directorio)
+        return resultado
+
+    def encuadre(self):
+        camara = self.camera
+        centro = np.asarray(camara.frame_center, dtype=float)
+        return (centro[0], centro[1], float(camara.frame_width))
+
+    def forma(self, mob, puntos):
+        """Indice de la forma de ``mob`` con ``puntos``, guardandola si es nueva."""
+        trazo = _hex(mob.get_stroke_rgbas()[0])
+        relleno = _hex(mob.get_fill_rgbas()[0])
+        puntos = np.ascontiguousarray(puntos, dtype=np.float32)
+        clave = (trazo, relleno, puntos.tobytes())
+        if clave not in self._indices_formas:
+            self._indices_formas[clave] = len(self._formas)
+            self._formas.append({"trazo": trazo, "relleno": relleno, "puntos": puntos})
+        return self._indices_formas[clave]
+
+    def capturar(self):
+        mobjects = Camera.get_mobjects_to_display(
+            self.camera, list_update(self.mobjects, self.foreground_mobjects)
+        )
+        fila = {}
+        for orden, mob in enumerate(m for m in mobjects if isinstance(m, VMobject)):
+            puntos = mob.points[:, :2]
+            pista = self._pistas.get(id(mob))
+            afin = None
+            if pista is not None:
+                indice, _, forma, origen = pista
+                misma = (
+                    len(origen) == len(puntos)
+                    and self._formas[forma]["trazo"] == _hex(mob.get_stroke_rgbas()[0])
+                    and self._formas[forma]["relleno"] == _hex(mob.get_fill_rgbas()[0])
+                )
+                afin = ajustar_afin(origen, puntos) if misma else None
+            if afin is None:
+                # Forma nueva: a partir de aqui se transforma desde esta
+                indice = pista[0] if pista is not None else len(self._pistas)
+                forma = self.forma(mob, puntos)
+                self._pistas[id(mob)] = (indice, mob, forma, puntos.copy())
+                afin = (1, 0, 0, 1, 0, 0)
+            fila[indice] = (
+                forma, *afin, mob.get_stroke_opacity(), mob.get_fill_opacity(),
+                mob.get_stroke_width(), orden,
+            )
+        return fila
+
+    def guardar_vectorial(self, directorio):
+        n_pistas = len(self._pistas)
+        tabla = np.zeros((len(self._fotogramas), n_pistas, len(CAMPOS)))
+        tabla[..., 0] = -1
+        for i, fila in enumerate(self._fotogramas):
+            for pista, valores in fila.items():
+                tabla[i, pista] = valores
+        tabla = np.hstack([tabla.reshape(len(tabla), -1), np.array(self._camara).reshape(len(tabla), 3)])
+
+        cabecera = json.dumps({
+            "escena": str(self),
+            "frame_rate": config.frame_rate,
+            "aspecto": config.frame_height / config.frame_width,
+            "fondo": _hex(np.asarray(config.background_color.rgb)),
+            "grosor_por_unidad": self.camera.cairo_line_width_multiple,
+            "campos": CAMPOS,
+            "n_pistas": n_pistas,
+            "n_fotogramas": len(tabla),
+            "formas": [
+                {"trazo": f["trazo"], "relleno": f["relleno"], "n": len(f["puntos"])}
+                for f in self._formas
+            ],
+        }).encode("utf-8")
+        puntos = np.concatenate([f["puntos"] for f in self._formas] or [np.zeros((0, 2), np.float32)])
+        datos = gzip.compress(
+            len(cabecera).to_bytes(4, "little") + cabecera
+            + puntos.astype("<f4").tobytes() + codificar_deltas(tabla).astype("<f4").tobytes(),
+            compresslevel=9,
+        )
+        directorio.mkdir(parents=True, exist_ok=True)
+        pagina = REPRODUCTOR.replace("{escena}", str(self)).replace(
+            "{datos}", base64.b64encode(datos).decode("ascii")
+        )
+        (directorio / f"{self}.html").write_text(pagina, encoding="utf-8")
+
+
+REPRODUCTOR = """<!doctype html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{escena}</title>
+<style>
+  body { margin: 0; background: #000; display: flex; flex-direction: column; height: 100vh; }
+  canvas { flex: 1; width: 100%; min-height: 0; }
+  p { margin: 0.3em; display: flex; gap: 0.5em; }
+  input[type=range] { flex: 1; }
+</style>
+</head>
+<body>
+<canvas id="lienzo"></canvas>
+<p><button id="pausa">&#9199;</button><input type="range" id="posicion" min="0" value="0"></p>
+<script>
+const DATOS = "{datos}";
+
+async function leer() {
+  const comprimido = Uint8Array.from(atob(DATOS), c => c.charCodeAt(0));
+  const flujo = new Blob([comprimido]).stream().pipeThrough(new DecompressionStream("gzip"));
+  const buffer = await new Response(flujo).arrayBuffer();
+  const largo = new DataView(buffer).getUint32(0, true);
+  const cabecera = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, largo)));
+  const resto = buffer.slice(4 + largo);
+  const nPuntos = cabecera.formas.reduce((s, f) => s + f.n, 0);
+  const puntos = new Float32Array(resto, 0, 2 * nPuntos);
+  let desplazamiento = 0;
+  for (const forma of cabecera.formas) {
+    forma.puntos = puntos.subarray(desplazamiento, desplazamiento + 2 * forma.n);
+    desplazamiento += 2 * forma.n;
+  }
+  // Sumamos las diferencias para reconstruir cada fotograma
+  const deltas = new Float32Array(resto, 8 * nPuntos);
+  const columnas = cabecera.n_pistas * cabecera.campos.length + 3;
+  const fotogramas = new Float64Array(deltas.length);
+  for (let i = 0; i < deltas.length; i++) {
+    fotogramas[i] = deltas[i] + (i >= columnas ? fotogramas[i - columnas] : 0);
+  }
+  return { cabecera, fotogramas, columnas };
+}
+
+function dibujar(ctx, escena, n) {
+  const { cabecera, fotogramas, columnas } = escena;
+  const W = ctx.canvas.width, H = ctx.canvas.height;
+  const fila = fotogramas.subarray(n * columnas, (n + 1) * columnas);
+  const [cx, cy, ancho] = fila.subarray(columnas - 3);
+  const escala = Math.min(W / ancho, H / (ancho * cabecera.aspecto));
+  const px = x => W / 2 + (x - cx) * escala;
+  const py = y => H / 2 - (y - cy) * escala;
+  ctx.fillStyle = "#000";
+  ctx.fillRect(0, 0, W, H);
+  ctx.fillStyle = cabecera.fondo;
+  ctx.fillRect(W / 2 - ancho * escala / 2, H / 2 - ancho * cabecera.aspecto * escala / 2, ancho * escala, ancho * cabecera.aspecto * escala);
+
+  const k = cabecera.campos.length;
+  const visibles = [];
+  for (let p = 0; p < cabecera.n_pistas; p++) {
+    const v = fila.subarray(p * k, (p + 1) * k);
+    if (v[0] > -0.5) visibles.push(v);
+  }
+  visibles.sort((u, v) => u[10] - v[10]);
+  for (const [forma, a, b, c, d, tx, ty, opTrazo, opRelleno, grosor] of visibles) {
+    const f = cabecera.formas[Math.round(forma)];
+    const q = f.puntos;
+    const X = i => px(a * q[2 * i] + b * q[2 * i + 1] + tx);
+    const Y = i => py(c * q[2 * i] + d * q[2 * i + 1] + ty);
+    ctx.beginPath();
+    let inicio = 0;
+    for (let i = 0; i + 3 < f.n; i += 4) {
+      if (i === 0 || q[2 * i] !== q[2 * i - 2] || q[2 * i + 1] !== q[2 * i - 1]) {
+        if (i > 0 && q[2 * inicio] === q[2 * i - 2] && q[2 * inicio + 1] === q[2 * i - 1]) ctx.closePath();
+        ctx.moveTo(X(i), Y(i));
+        inicio = i;
+      }
+      ctx.bezierCurveTo(X(i + 1), Y(i + 1), X(i + 2), Y(i + 2), X(i + 3), Y(i + 3));
+    }
+    if (f.n > 0 && q[2 * inicio] === q[2 * f.n - 2] && q[2 * inicio + 1] === q[2 * f.n - 1]) ctx.closePath();
+    if (opRelleno > 0) {
+      ctx.globalAlpha = Math.min(opRelleno, 1);
+      ctx.fillStyle = f.relleno;
+      ctx.fill();
+    }
+    if (opTrazo > 0 && grosor > 0) {
+      ctx.globalAlpha = Math.min(opTrazo, 1);
+      ctx.strokeStyle = f.trazo;
+      ctx.lineWidth = grosor * cabecera.grosor_por_unidad * escala;
+      ctx.stroke();
+    }
+    ctx.globalAlpha = 1;
+  }
+}
+
+leer().then(escena => {
+  const lienzo = document.getElementById("lienzo");
+  const ctx = lienzo.getContext("2d");
+  const posicion = document.getElementById("posicion");
+  const total = escena.cabecera.n_fotogramas;
+  posicion.max = total - 1;
+  let n = 0, reproduciendo = true, origen = performance.now();
+
+  function ajustar() {
+    lienzo.width = lienzo.clientWidth * devicePixelRatio;
+    lienzo.height = lienzo.clientHeight * devicePixelRatio;
+  }
+  window.addEventListener("resize", ajustar);
+  ajustar();
+
+  document.getElementById("pausa").onclick = () => {
+    reproduciendo = !reproduciendo;
+    origen = performance.now() - n * 1000 / escena.cabecera.frame_rate;
+  };
+  posicion.oninput = () => {
+    n = Number(posicion.value);
+    origen = performance.now() - n * 1000 / escena.cabecera.frame_rate;
+  };
+
+  function paso(ahora) {
+    if (reproduciendo) {
+      n = Math.min(Math.floor((ahora - origen) * escena.cabecera.frame_rate / 1000), total - 1);
+      posicion.value = n;
+    }
+    dibujar(ctx, escena, n);
+    requestAnimationFrame(paso);
+  }
+  requestAnimationFrame(paso);
+});
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,156 @@
+"""Graficas de funciones con muestreo adaptativo.
+
+``sr.plot`` toma muestras equiespaciadas (diez por marca del eje) tanto si la
+curva es una recta como si oscila mucho. ``trazar(sr, func, ...)`` se usa
+igual, pero reparte las muestras segun la forma de la curva: cada tramo es un
+cubico de Hermite con las tangentes de la curva y se divide por la mitad
+mientras se separe de la funcion mas de ``tolerancia_px`` pixeles a la
+resolucion del render. Una recta queda con unos pocos tramos y una curva con
+oscilaciones rapidas con muchos, de modo que hay menos puntos que rasterizar
+y que interpolar en ``Create`` y ``Transform``.
+
+Las escenas repiten los mismos ejes y vuelven a trazar la misma funcion sobre
+el mismo tramo varias veces. ``sistema_referencia`` y ``trazar`` construyen
+cada ejes y cada grafica una sola vez por proceso (con ``render_lote`` o el
+servidor de render, una vez para todas las escenas) y devuelven copias, que
+cada escena puede mover, colorear o animar sin afectar a las demas.
+"""
+from manim import Axes, ParametricFunction, config
+import numpy as np
+
+from cache import SinHuella, huella, huella_funcion
+from trayectorias import c2p_lote, evaluar, huella_ejes
+
+# Tramos de partida y numero maximo de subdivisiones de cada uno
+TRAMOS_INICIALES = 8
+MAX_NIVELES = 16
+
+# Posiciones (entre 0 y 1) de cada tramo en las que se mide el error
+_S = np.array([0.25, 0.5, 0.75])
+
+# Opciones de estilo que se aplican a la copia en vez de formar parte de la clave
+ESTILO = ("color", "stroke_width", "stroke_opacity")
+
+# Ejes y graficas ya construidos en este proceso
+_EJES = {}
+_GRAFICAS = {}
+
+
+class GraficaAdaptativa(ParametricFunction):
+    """Grafica de ``y = function(x)`` sobre los ejes ``sr`` con muestreo adaptativo.
+
+    ``zoom`` es el aumento maximo con el que la camara va a ver la curva;
+    la tolerancia se reduce en la misma proporcion.
+    """
+
+    def __init__(self, sr, function, x_range=None, tolerancia_px=0.5, zoom=1, **kwargs):
+        # Una funcion y no los ejes: copy() copia en profundidad los atributos
+        # y no queremos copiar los ejes con cada grafica
+        self._c2p = lambda xs, ys: c2p_lote(sr, xs, ys)
+        self.underlying_function = function
+        self.tolerancia = tolerancia_px * config.frame_width / config.pixel_width / zoom
+        t_range = np.array(sr.x_range, dtype=float)
+        if x_range is not None:
+            t_range[: len(x_range)] = x_range
+        super().__init__(
+            lambda t: sr.c2p(t, function(t)),
+            t_range=t_range,
+            scaling=sr.x_axis.scaling,
+            **kwargs,
+        )
+
+    def puntos_y_tangentes(self, ts):
+        """Puntos de la curva en la escena y sus derivadas respecto a ``x``."""
+        func = self.underlying_function
+        h = 1e-6 * max(1, self.t_max - self.t_min)
+        antes = np.maximum(ts - h, self.t_min)
+        despues = np.minimum(ts + h, self.t_max)
+        puntos = self._c2p(ts, evaluar(func, ts))
+        tangentes = (
+            self._c2p(despues, evaluar(func, despues))
+            - self._c2p(antes, evaluar(func, antes))
+        ) / (despues - antes)[:, None]
+        return puntos, tangentes
+
+    def generate_points(self):
+        ts = np.linspace(self.t_min, self.t_max, TRAMOS_INICIALES + 1)
+        for _ in range(MAX_NIVELES):
+            puntos, tangentes = self.puntos_y_tangentes(ts)
+            p0, p1 = puntos[:-1, None], puntos[1:, None]
+            dt = (ts[1:] - ts[:-1])[:, None, None]
+            m0, m1 = tangentes[:-1, None] * dt, tangentes[1:, None] * dt
+
+            # Cubico de Hermite de cada tramo frente a la funcion
+            s = _S[None, :, None]
+            hermite = (
+                (2*s**3 - 3*s**2 + 1) * p0 + (s**3 - 2*s**2 + s) * m0
+                + (-2*s**3 + 3*s**2) * p1 + (s**3 - s**2) * m1
+            )
+            tm = ts[:-1, None] + _S[None, :] * dt[:, :, 0]
+            reales = self._c2p(tm.ravel(), evaluar(self.underlying_function, tm.ravel()))
+            error = np.linalg.norm(reales.reshape(hermite.shape) - hermite, axis=-1).max(axis=1)
+
+            malos = error > self.tolerancia
+            if not malos.any():
+                break
+            ts = np.sort(np.concatenate([ts, (ts[:-1] + ts[1:])[malos] / 2]))
+
+        # Cada tramo de Hermite es una curva de Bezier con las asas a un
+        # tercio de la tangente
+        self.set_points(np.stack([
+            puntos[:-1],
+            puntos[:-1] + tangentes[:-1] * dt[:, 0] / 3,
+            puntos[1:] - tangentes[1:] * dt[:, 0] / 3,
+            puntos[1:],
+        ], axis=1).reshape(-1, 3))
+        return self
+
+    init_points = generate_points
+
+
+def _opciones(kwargs):
+    return sorted((clave, repr(valor)) for clave, valor in kwargs.items())
+
+
+def sistema_referencia(coordenadas=True, **kwargs):
+    """Copia de ``Axes(**kwargs)``, con ``add_coordinates()`` si ``coordenadas``.
+
+    Los ejes con las mismas opciones se construyen una sola vez por proceso.
+    """
+    clave = huella(_opciones(kwargs), coordenadas, config.frame_width, config.frame_height)
+    if clave not in _EJES:
+        sr = Axes(**kwargs)
+        if coordenadas:
+            sr.add_coordinates()
+        _EJES[clave] = sr
+    return _EJES[clave].copy()
+
+
+def trazar(sr, func, x_range=None, **kwargs):
+    """Como ``sr.plot(func, x_range, ...)`` pero con muestreo adaptativo.
+
+    La geometria se calcula una vez por ejes, funcion, tramo y tolerancia; el
+    color y el trazo se aplican a cada copia.
+    """
+    estilo = {clave: kwargs.pop(clave) for clave in ESTILO if clave in kwargs}
+    tramo = None if x_range is None else [float(x) for x in x_range]
+    try:
+        clave = huella(
+            huella_ejes(sr), huella_funcion(func), tramo, _opciones(kwargs),
+            config.pixel_width, config.frame_width,
+        )
+    except SinHuella:
+        clave = None
+    if clave is None:
+        grafica = GraficaAdaptativa(sr, func, x_range, **kwargs)
+    else:
+        if clave not in _GRAFICAS:
+            _GRAFICAS[clave] = GraficaAdaptativa(sr, func, x_range, **kwargs)
+        grafica = _GRAFICAS[clave].copy()
+    if "color" in estilo:
+        grafica.set_color(estilo["color"])
+    if "stroke_width" in estilo or "stroke_opacity" in estilo:
+        grafica.set_stroke(
+            width=estilo.get("stroke_width"), opacity=estilo.get("stroke_opacity")
+        )
+    return grafica
@@ -0,0 +1,293 @@
+"""Lecciones descritas con datos (JSON o YAML) en lugar de con codigo.
+
+Uso::
+
+    python cinematica/lecciones.py -q l                      # todas las lecciones y variantes
+    python cinematica/lecciones.py Desplazamiento_v003 -q h
+
+Cada fichero de ``cinematica/especificaciones`` describe el sistema de
+referencia, los puntos, las trayectorias y el guion de la leccion con los
+mismos patrones que las escenas escritas a mano (vectores de posicion, un
+objeto recorriendo cada trayectoria, espacio recorrido, vector desplazamiento
+y movimientos de camara). Al importar este modulo cada fichero se compila en
+una escena y, si tiene ``variantes``, en una escena mas por variante, con los
+puntos y los parametros de las trayectorias elegidos al azar (con semilla, asi
+que siempre salen las mismas). ``render_lote.py`` las encuentra como al resto.
+
+Las trayectorias son expresiones de SymPy en ``x`` que pueden usar las
+coordenadas de los puntos (``xP``, ``yQ``...) y los ``parametros``. Los ejes,
+las graficas y las tablas de las trayectorias se construyen una vez por
+proceso y se reutilizan en todas las variantes que se renderizan en el.
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+from pathlib import Path
+
+import manim
+from manim import (
+    Create, Dot, FadeOut, Restore, ValueTracker, Write, config, linear,
+)
+import numpy as np
+import sympy as sym
+
+from escena import EscenaCinematica
+from graficas import sistema_referencia, trazar
+from render_lote import renderizar_lote
+from tex import mathtex
+from trayectorias import Trayectoria, compilar_trayectoria, huella_ejes
+from vectores import FlechaVector
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DIRECTORIO = Path(__file__).resolve().parent / "especificaciones"
+
+# Tablas de trayectorias compartidas por todas las lecciones que se renderizan
+# en este proceso (los ejes y las graficas los comparte graficas.py)
+_TRAYECTORIAS = {}
+
+
+def leer_especificacion(ruta):
+    ruta = Path(ruta)
+    texto = ruta.read_text(encoding="utf-8")
+    if ruta.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError(f"Hace falta PyYAML para leer {ruta.name}")
+        return yaml.safe_load(texto)
+    return json.loads(texto)
+
+
+def constante(valor):
+    """Color o direccion de manim a partir de su nombre (``"BLUE_B"``, ``"RIGHT"``) o de una lista."""
+    if isinstance(valor, str):
+        return valor if valor.startswith("#") else getattr(manim, valor)
+    return np.array([*valor, 0, 0][:3], dtype=float)
+
+
+def generar_variantes(espec):
+    """Especificaciones de las variantes pedidas en ``espec["variantes"]``."""
+    ajustes = espec.get("variantes")
+    if not ajustes:
+        return []
+    azar = random.Random(ajustes.get("semilla", 0))
+    variantes = []
+    for i in range(1, ajustes["n"] + 1):
+        variante = copy.deepcopy(espec)
+        del variante["variantes"]
+        variante["nombre"] = f"{espec['nombre']}_v{i:03}"
+        for punto, rangos in ajustes.get("puntos", {}).items():
+            for coordenada, (a, b) in rangos.items():
+                variante["puntos"][punto][coordenada] = round(azar.uniform(a, b), 2)
+        for parametro, (a, b) in ajustes.get("parametros", {}).items():
+            variante.setdefault("parametros", {})[parametro] = round(azar.uniform(a, b), 2)
+        variantes.append(variante)
+    return variantes
+
+
+def trayectoria(sr, expr, x_range, run_time, color):
+    """Funcion, grafica y tabla de la trayectoria ``y = expr(x)``, compartidas entre escenas."""
+    clave = (huella_ejes(sr), str(expr), tuple(x_range), run_time, config.frame_rate)
+    if clave not in _TRAYECTORIAS:
+        func, d_func, _ = compilar_trayectoria(expr, sym.Symbol("x", real=True))
+        tabla = Trayectoria(sr, func, *x_range, run_time=run_time, derivada=d_func)
+        _TRAYECTORIAS[clave] = (func, tabla)
+    func, tabla = _TRAYECTORIAS[clave]
+    return func, trazar(sr, func, x_range=x_range, color=color), tabla
+
+
+class LeccionDeclarativa(EscenaCinematica):
+    """Escena que ejecuta el guion de la especificacion ``espec``."""
+
+    # render_lote no renderiza esta clase, solo las compiladas a partir de ella
+    abstracta = True
+    espec = None
+
+    def construct(self):
+        espec = self.espec
+        self.sr = sistema_referencia(**espec["sistema_referencia"])
+        self.objetos = {"sr": self.sr}
+        self.etiquetas = {}
+
+        # Valores que pueden usar las expresiones: coordenadas de los puntos y parametros
+        self.valores = {k: sym.Float(v) for k, v in espec.get("parametros", {}).items()}
+        for nombre, punto in espec.get("puntos", {}).items():
+            self.valores[f"x{nombre}"] = sym.Float(punto["x"])
+            self.valores[f"y{nombre}"] = sym.Float(punto["y"])
+            dot = Dot(self.sr.c2p(punto["x"], punto["y"]))
+            self.objetos[nombre] = dot
+            self.etiquetas[nombre] = mathtex(punto.get("etiqueta", nombre)).next_to(
+                dot, constante(punto.get("direccion", "RIGHT"))
+            )
+
+        self.trayectorias = {}
+        for datos in espec.get("trayectorias", []):
+            nombre = datos["nombre"]
+            x = sym.Symbol("x", real=True)
+            expr = sym.sympify(datos["expr"], locals={"x": x}).subs(self.valores)
+            x_range = [self.evaluar(v) for v in datos.get("x_range", self.sr.x_range[:2])]
+            color = constante(datos.get("color", "WHITE"))
+            func, grafica, tabla = trayectoria(
+                self.sr, expr, x_range, datos.get("run_time", 5), color
+            )
+            self.trayectorias[nombre] = (func, tabla, color)
+            self.objetos[nombre] = grafica
+            self.etiquetas[nombre] = mathtex(datos.get("etiqueta", nombre), color=color).move_to(
+                self.sr.c2p(*datos.get("posicion_etiqueta", [x_range[1], func(x_range[1])]))
+            ).shift(0.5 * manim.UR)
+
+        for paso in espec["guion"]:
+            paso = dict(paso)
+            getattr(self, f"accion_{paso.pop('accion')}")(**paso)
+
+    def trozos_secciones(self):
+        # Las secciones salen del guion, no del codigo de construct
+        guion = self.espec["guion"]
+        cortes = [i for i, paso in enumerate(guion) if paso["accion"] == "seccion"]
+        resto = {k: v for k, v in self.espec.items() if k not in ("guion", "nombre")}
+        cabecera = json.dumps([resto, guion[:cortes[0] if cortes else None]], sort_keys=True)
+        return cabecera, [
+            json.dumps(guion[inicio:fin], sort_keys=True)
+            for inicio, fin in zip(cortes, cortes[1:] + [None])
+        ]
+
+    def evaluar(self, valor):
+        return float(sym.sympify(valor).subs(self.valores))
+
+    def punto(self, coordenadas):
+        return self.sr.c2p(*[self.evaluar(v) for v in coordenadas])
+
+    def mobjects(self, nombres):
+        grupo = []
+        for nombre in nombres:
+            grupo.append(self.objetos[nombre])
+            if nombre in self.etiquetas:
+                grupo.append(self.etiquetas[nombre])
+        return grupo
+
+    # Acciones del guion
+
+    def accion_seccion(self, nombre):
+        self.seccion(nombre)
+
+    def accion_esperar(self, duracion=1):
+        self.wait(duracion)
+
+    def accion_crear(self, objetos, run_time=1):
+        animaciones = []
+        for nombre in objetos:
+            animaciones.append(Create(self.objetos[nombre]))
+            if nombre in self.etiquetas:
+                animaciones.append(Write(self.etiquetas[nombre]))
+        self.play(*animaciones, run_time=run_time)
+
+    def accion_quitar(self, objetos, run_time=1):
+        self.play(FadeOut(*self.mobjects(objetos)), run_time=run_time)
+
+    def accion_guardar_camara(self):
+        self.camera.frame.save_state()
+
+    def accion_restaurar_camara(self, run_time=1):
+        self.play(Restore(self.camera.frame), run_time=run_time)
+
+    def accion_camara(self, centro=None, ancho=None, run_time=1):
+        """Mueve la camara a ``centro`` (en coordenadas de los ejes) con ``ancho`` veces el de los ejes."""
+        animacion = self.camera.frame.animate
+        if centro is not None:
+            animacion = animacion.move_to(self.punto(centro))
+        if ancho is not None:
+            animacion = animacion.set(width=self.sr.width * ancho)
+        self.play(animacion, run_time=run_time)
+
+    def accion_vectores_posicion(self, puntos, run_time=1):
+        origen = self.sr.get_origin()
+        for nombre in puntos:
+            vector = FlechaVector(origen, self.objetos[nombre].get_center(), stroke_width=2.5, tip_length=0.2)
+            self.objetos[f"r_{nombre}"] = vector
+            self.etiquetas[f"r_{nombre}"] = mathtex(rf"\vec{{r_{{{nombre}}}}}").next_to(
+                vector.get_center(), manim.UL * 0.5
+            )
+            self.accion_crear([f"r_{nombre}"], run_time=run_time)
+
+    def accion_recorrer(self, trayectoria, desde=None, hasta=None, vector_posicion=False, run_time=5):
+        """Un objeto recorre la trayectoria, opcionalmente con su vector de posicion."""
+        func, tabla, color = self.trayectorias[trayectoria]
+        desde = tabla.parametros[0] if desde is None else self.evaluar(desde)
+        hasta = tabla.parametros[-1] if hasta is None else self.evaluar(hasta)
+        tracker = ValueTracker(desde)
+        dot = Dot(tabla.punto(desde), color=color, radius=0.1)
+        self.anadir_actualizador(dot, tabla.actualizador(tracker), tracker)
+        self.objetos[f"movil_{trayectoria}"] = dot
+        self.add(dot)
+        if vector_posicion:
+            origen = self.sr.get_origin()
+            vector = FlechaVector(origen, dot.get_center(), stroke_width=2.5, tip_length=0.2)
+            self.anadir_actualizador(vector, lambda x: x.put_start_and_end_on(origen, dot.get_center()), dot)
+            self.objetos[f"r_movil_{trayectoria}"] = vector
+            self.add(vector)
+        self.play(tracker.animate.set_value(hasta), run_time=run_time, rate_func=linear)
+
+    def accion_espacio_recorrido(self, trayectoria, x_range, color="YELLOW_C", run_time=1):
+        func, _, _ = self.trayectorias[trayectoria]
+        espacio = trazar(self.sr, func, x_range=[self.evaluar(v) for v in x_range], color=constante(color))
+        self.objetos[f"s_{trayectoria}"] = espacio
+        self.etiquetas[f"s_{trayectoria}"] = mathtex(r"\Delta s", color=constante(color)).next_to(
+            espacio.get_center(), manim.UR * 0.5
+        )
+        self.accion_crear([f"s_{trayectoria}"], run_time=run_time)
+
+    def accion_desplazamiento(self, desde, hasta, color="BLUE", run_time=1):
+        color = constante(color)
+        vector = FlechaVector(
+            self.objetos[desde].get_center(), self.objetos[hasta].get_center(),
+            stroke_width=4, tip_length=0.25, color=color,
+        )
+        self.objetos["desplazamiento"] = vector
+        self.etiquetas["desplazamiento"] = mathtex(r"\Delta \vec{r}", color=color).next_to(
+            vector.get_center(), manim.DOWN * 0.5
+        )
+        self.accion_crear(["desplazamiento"], run_time=run_time)
+
+
+def compilar_leccion(espec):
+    """Clase de escena para la especificacion ``espec``."""
+    return type(espec["nombre"], (LeccionDeclarativa,), {"espec": espec, "__module__": __name__})
+
+
+def cargar_lecciones(directorio=DIRECTORIO):
+    """Diccionario ``nombre -> escena`` con las lecciones del directorio y sus variantes."""
+    escenas = {}
+    for ruta in sorted(Path(directorio).glob("*")):
+        if ruta.suffix not in (".json", ".yaml", ".yml"):
+            continue
+        espec = leer_especificacion(ruta)
+        for variante in [espec, *generar_variantes(espec)]:
+            escenas[variante["nombre"]] = compilar_leccion(variante)
+    return escenas
+
+
+LECCIONES = cargar_lecciones()
+globals().update(LECCIONES)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("escenas", nargs="*", help="lecciones a renderizar (por defecto, todas)")
+    parser.add_argument("-q", "--calidad", nargs="+", default=["l"], help="calidades: l m h p k")
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--media_dir", default="media", help="directorio de salida de manim")
+    args = parser.parse_args(argv)
+
+    nombres = args.escenas or list(LECCIONES)
+    trabajos = [(__file__, nombre, calidad) for nombre in nombres for calidad in args.calidad]
+    # Cada proceso renderiza varias lecciones seguidas y reutiliza ejes y trayectorias
+    resultados = renderizar_lote(trabajos, args.procesos, {"media_dir": args.media_dir, "progress_bar": "none"})
+    return 1 if any("error" in r for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Espacio recorrido (longitud de arco) de una trayectoria ``y = f(x)``.
+
+    Δs = ∫ sqrt(1 + f'(x)^2) dx  entre a y b
+
+La integral se calcula con una cuadratura de Gauss-Legendre adaptativa en la
+que todos los subintervalos pendientes se evaluan de una vez con NumPy. Los
+resultados se guardan en disco, asi que volver a renderizar no cuesta nada.
+"""
+import functools
+
+import numpy as np
+from scipy.special import roots_legendre
+
+from cache import SinHuella, directorio_cache, escribir_json, huella, huella_funcion, leer_json
+from trayectorias import evaluar
+
+# Orden de la cuadratura y tolerancia absoluta
+ORDEN = 16
+TOLERANCIA = 1e-10
+
+
+def derivada(func, xs):
+    """Derivada numerica (diferencias centradas de 5 puntos) sobre el array ``xs``."""
+    h = 1e-4 * np.maximum(1, np.abs(xs))
+    return (
+        evaluar(func, xs - 2 * h) - 8 * evaluar(func, xs - h)
+        + 8 * evaluar(func, xs + h) - evaluar(func, xs + 2 * h)
+    ) / (12 * h)
+
+
+def _integrar(integrando, a, b, max_iter=40):
+    """Integral de ``integrando`` entre ``a`` y ``b`` (con signo, como en una integral)."""
+    if a == b:
+        return 0.0
+    if b < a:
+        return -_integrar(integrando, b, a, max_iter)
+    nodos, pesos = roots_legendre(ORDEN)
+    intervalos = np.array([[a, b]], dtype=float)
+    total = 0.0
+    for _ in range(max_iter):
+        izq, der = intervalos[:, :1], intervalos[:, 1:]
+        medio = (izq + der) / 2
+        # Cada intervalo se integra entero y partido en dos mitades,
+        # evaluando todos los nodos en una sola llamada
+        radios = np.concatenate([der - izq, der - medio, medio - izq], axis=1) / 2
+        centros = np.concatenate([medio, (medio + der) / 2, (izq + medio) / 2], axis=1)
+        xs = centros[..., None] + radios[..., None] * nodos
+        valores = (integrando(xs) * pesos).sum(axis=-1) * radios
+        grueso, fino = valores[:, 0], valores[:, 1] + valores[:, 2]
+        # Repartimos la tolerancia segun el tamaño de cada intervalo
+        tolerancia = TOLERANCIA * (der - izq)[:, 0] / abs(b - a)
+        convergido = np.abs(fino - grueso) <= tolerancia
+        total += fino[convergido].sum()
+        pendientes = intervalos[~convergido]
+        if len(pendientes) == 0:
+            break
+        medio = pendientes.mean(axis=1)
+        intervalos = np.concatenate([
+            np.stack([pendientes[:, 0], medio], axis=1),
+            np.stack([medio, pendientes[:, 1]], axis=1),
+        ])
+    else:
+        total += fino[~convergido].sum()
+    return float(total)
+
+
+def longitud_arco(func, a, b, d_func=None):
+    """Longitud de arco de ``y = func(x)`` entre ``a`` y ``b``.
+
+    La longitud es positiva aunque la trayectoria se recorra hacia atras
+    (``b < a``). Si se conoce la derivada exacta ``d_func`` se usa en lugar de
+    la numerica.
+    """
+    ruta = directorio_cache() / "longitud_arco.json"
+    try:
+        clave = huella(
+            huella_funcion(func), huella_funcion(d_func) if d_func is not None else None,
+            float(a), float(b),
+        )
+    except SinHuella:
+        clave = None
+    cache = leer_json(ruta) if clave is not None else {}
+    if clave not in cache:
+        if d_func is None:
+            d_func = functools.partial(derivada, func)
+        longitud = abs(_integrar(lambda xs: np.sqrt(1 + evaluar(d_func, xs) ** 2), a, b))
+        if clave is None:
+            return longitud
+        cache[clave] = longitud
+        escribir_json(ruta, cache)
+    return cache[clave]
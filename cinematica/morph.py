@@ -0,0 +1,125 @@
+"""``Transform`` con el alineamiento de puntos precalculado y guardado en disco.
+
+Al empezar un ``Transform``, manim iguala el numero de submobjects y de
+curvas del origen y del destino y empareja sus subtrayectos (``align_data``).
+Con curvas largas y formulas es la parte cara de la animacion, y se repite en
+cada render aunque las formas no hayan cambiado. ``MorphPlanificado`` guarda
+el resultado del alineamiento (los puntos ya alineados de cada mobject de las
+dos familias) con la huella de la geometria de origen y destino, en memoria y
+en la cache de disco; la geometria no depende de la calidad, asi que el plan
+sirve para todas. En cada fotograma se interpola de una vez entre dos arrays
+con los puntos de toda la familia.
+"""
+import os
+import tempfile
+import zipfile
+
+from manim import Animation, Transform, config
+import numpy as np
+
+from cache import directorio_cache, huella
+
+# Planes ya cargados en este proceso
+_PLANES = {}
+
+
+def huella_geometria(mob):
+    """Huella de la estructura y los puntos de la familia de ``mob``."""
+    return huella([
+        (type(m).__name__, len(m.submobjects), m.points.shape, m.points.tobytes())
+        for m in mob.get_family()
+    ])
+
+
+def cargar_plan(clave):
+    """Plan ``(puntos de origen, puntos de destino)`` guardado, o None."""
+    if clave not in _PLANES:
+        try:
+            # Sin pickle: el directorio de cache puede estar compartido
+            with np.load(directorio_cache("morph") / f"{clave}.npz", allow_pickle=False) as datos:
+                n_origen, n_destino = datos["tamanos"]
+                _PLANES[clave] = (
+                    [datos[f"o{i}"] for i in range(n_origen)],
+                    [datos[f"d{i}"] for i in range(n_destino)],
+                )
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+    return _PLANES[clave]
+
+
+def guardar_plan(clave, plan):
+    _PLANES[clave] = plan
+    origen, destino = plan
+    ruta = directorio_cache("morph") / f"{clave}.npz"
+    fd, temporal = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(
+            f, tamanos=np.array([len(origen), len(destino)]),
+            **{f"o{i}": puntos for i, puntos in enumerate(origen)},
+            **{f"d{i}": puntos for i, puntos in enumerate(destino)},
+        )
+    os.replace(temporal, ruta)
+
+
+def alinear_estructura(m1, m2):
+    """La parte barata de ``align_data``: submobjects y colores, sin los puntos."""
+    m1.null_point_align(m2)
+    m1.align_submobjects(m2)
+    if hasattr(m1, "align_rgbas"):
+        m1.align_rgbas(m2)
+    for sub1, sub2 in zip(m1.submobjects, m2.submobjects):
+        alinear_estructura(sub1, sub2)
+
+
+class MorphPlanificado(Transform):
+    """``Transform`` que reutiliza el alineamiento guardado de origen y destino."""
+
+    def begin(self):
+        self._familias = None
+        if config.renderer != "cairo":
+            return super().begin()
+        self.target_mobject = self.create_target()
+        self.target_copy = self.target_mobject.copy()
+        clave = huella(huella_geometria(self.mobject), huella_geometria(self.target_copy))
+        plan = cargar_plan(clave)
+        if plan is not None:
+            alinear_estructura(self.mobject, self.target_copy)
+            origen, destino = self.mobject.get_family(), self.target_copy.get_family()
+            if len(origen) == len(plan[0]) and len(destino) == len(plan[1]):
+                for mob, puntos in zip(origen, plan[0]):
+                    mob.points = puntos.copy()
+                for mob, puntos in zip(destino, plan[1]):
+                    mob.points = puntos.copy()
+            else:
+                plan = None
+        if plan is None:
+            self.mobject.align_data(self.target_copy)
+            guardar_plan(clave, (
+                [m.points.copy() for m in self.mobject.get_family()],
+                [m.points.copy() for m in self.target_copy.get_family()],
+            ))
+        Animation.begin(self)
+
+        # Puntos de toda la familia en un solo array para interpolar de golpe
+        self._familias = list(self.get_all_families_zipped())
+        vacio = [np.zeros((0, 3))]
+        self._inicio = np.concatenate([inicio.points for _, inicio, _ in self._familias] or vacio)
+        self._fin = np.concatenate([fin.points for _, _, fin in self._familias] or vacio)
+
+    def interpolate_mobject(self, alpha):
+        if self._familias is None or self.lag_ratio != 0:
+            return super().interpolate_mobject(alpha)
+        alpha = self.rate_func(alpha)
+        puntos = self.path_func(self._inicio, self._fin, alpha)
+        corte = 0
+        for mob, inicio, fin in self._familias:
+            n = len(inicio.points)
+            mob.points = puntos[corte:corte + n]
+            corte += n
+            mob.interpolate_color(inicio, fin, alpha)
+
+    def finish(self):
+        super().finish()
+        # Que cada mobject vuelva a tener sus puntos en un array propio
+        for mob, _, _ in self._familias or []:
+            mob.points = mob.points.copy()
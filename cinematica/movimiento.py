@@ -0,0 +1,68 @@
+"""Magnitudes cinematicas calculadas con NumPy sobre arrays.
+
+Todas las funciones aceptan un solo vector o arrays con cualquier numero de
+dimensiones delante, de modo que se pueden calcular de una vez las magnitudes
+de todos los fotogramas de una animacion o de todas las variantes de un
+ejercicio. La ultima dimension es la de las coordenadas; en las funciones que
+reciben muestras de una trayectoria, la penultima es la del tiempo::
+
+    puntos = tabla.puntos                      # (n, 3)
+    velocidad_instantanea(puntos, tiempos)     # (n, 3)
+    distancia_recorrida(puntos)                # escalar
+"""
+import numpy as np
+
+
+def desplazamiento(r_inicio, r_final):
+    """Vector desplazamiento ``r_final - r_inicio``."""
+    return np.asarray(r_final, dtype=float) - np.asarray(r_inicio, dtype=float)
+
+
+def modulo(vectores):
+    """Modulo de cada vector."""
+    return np.linalg.norm(vectores, axis=-1)
+
+
+def direccion(vectores):
+    """Vector unitario de cada vector; los vectores nulos se quedan en cero."""
+    vectores = np.asarray(vectores, dtype=float)
+    modulos = np.linalg.norm(vectores, axis=-1, keepdims=True)
+    return vectores / np.where(modulos == 0, 1, modulos)
+
+
+def con_modulo(vectores, modulos):
+    """Vectores con la direccion de ``vectores`` y el modulo ``modulos``."""
+    return direccion(vectores) * np.asarray(modulos, dtype=float)[..., None]
+
+
+def trasladar(origen, vector):
+    """Extremos ``(inicio, fin)`` del vector colocado en ``origen``."""
+    origen = np.asarray(origen, dtype=float)
+    return origen, origen + vector
+
+
+def distancia_recorrida(puntos):
+    """Longitud del camino que une las muestras ``puntos`` en orden."""
+    return modulo(np.diff(puntos, axis=-2)).sum(axis=-1)
+
+
+def velocidad_media(r_inicio, r_final, t_total):
+    """Desplazamiento entre el tiempo transcurrido."""
+    return desplazamiento(r_inicio, r_final) / np.asarray(t_total, dtype=float)[..., None]
+
+
+def rapidez_media(puntos, t_total):
+    """Distancia recorrida entre el tiempo transcurrido."""
+    return distancia_recorrida(puntos) / np.asarray(t_total, dtype=float)
+
+
+def velocidad_instantanea(puntos, tiempos):
+    """Velocidad en cada muestra, con diferencias centradas de segundo orden.
+
+    En los extremos tambien se usan diferencias de segundo orden, que son
+    exactas para un movimiento uniformemente acelerado. Con solo dos muestras
+    se usa la diferencia entre ellas.
+    """
+    puntos = np.asarray(puntos, dtype=float)
+    orden = 2 if puntos.shape[-2] >= 3 else 1
+    return np.gradient(puntos, tiempos, axis=-2, edge_order=orden)
@@ -0,0 +1,131 @@
+"""Perfilado opcional del render de las escenas.
+
+Se activa con la variable de entorno ``FISICANIMADA_PERFIL``, que indica el
+directorio donde dejar los resultados::
+
+    FISICANIMADA_PERFIL=perfiles manim -ql cinematica/velocidades_media_instantanea.py Velocidades
+
+Para cada llamada a ``play``/``wait`` se mide el tiempo total y cuanto de el
+se va en updaters, en rasterizar con cairo y en mandar los fotogramas a
+ffmpeg, ademas del numero de mobjects y de puntos en escena. Se escriben dos
+ficheros por escena: ``<Escena>.json`` con el detalle y ``<Escena>.folded``
+con las pilas en el formato de ``flamegraph.pl``/speedscope.
+"""
+import os
+import time
+from pathlib import Path
+
+from manim import Scene, Wait, config
+
+from cache import escribir_json
+
+# Partes en las que se divide el tiempo de cada animacion
+PARTES = ("actualizadores", "rasterizado", "codificacion")
+
+
+def directorio_perfil():
+    ruta = os.environ.get("FISICANIMADA_PERFIL")
+    return Path(ruta) if ruta else None
+
+
+class PerfilRender(Scene):
+    """Mixin de escena que mide cada animacion si ``FISICANIMADA_PERFIL`` esta definida."""
+
+    def render(self, *args, **kwargs):
+        directorio = directorio_perfil()
+        if directorio is None:
+            return super().render(*args, **kwargs)
+        self.perfil = []
+        self._medida = dict.fromkeys(PARTES, 0.0)
+        self._fotogramas = 0
+        self.instrumentar()
+        inicio = time.perf_counter()
+        resultado = super().render(*args, **kwargs)
+        self.guardar_perfil(directorio, time.perf_counter() - inicio)
+        return resultado
+
+    def cronometrar(self, objeto, metodo, parte):
+        original = getattr(objeto, metodo)
+
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._medida[parte] += time.perf_counter() - inicio
+
+        setattr(objeto, metodo, medido)
+
+    def instrumentar(self):
+        renderer = self.renderer
+        for metodo in ("update_mobjects", "update_meshes", "update_self"):
+            self.cronometrar(self, metodo, "actualizadores")
+        self.cronometrar(renderer, "update_frame", "rasterizado")
+        self.cronometrar(renderer.file_writer, "write_frame", "codificacion")
+
+        write_frame = renderer.file_writer.write_frame
+
+        def write_frame_contando(*args, **kwargs):
+            self._fotogramas += 1
+            return write_frame(*args, **kwargs)
+
+        renderer.file_writer.write_frame = write_frame_contando
+
+        play = renderer.play
+
+        def play_medido(scene, *args, **kwargs):
+            self._medida = dict.fromkeys(PARTES, 0.0)
+            self._fotogramas = 0
+            inicio = time.perf_counter()
+            play(scene, *args, **kwargs)
+            self.registrar(time.perf_counter() - inicio)
+
+        renderer.play = play_medido
+
+    def registrar(self, segundos):
+        familia = self.get_mobject_family_members()
+        animaciones = self.animations or []
+        secciones = getattr(self, "secciones", None)
+        espera = len(animaciones) == 1 and isinstance(animaciones[0], Wait)
+        self.perfil.append({
+            "indice": len(self.perfil),
+            "seccion": secciones[-1][1] if secciones else None,
+            "tipo": "wait" if espera else "play",
+            # Una espera estatica se escribe como un solo fotograma repetido
+            "estatica": espera and animaciones[0].is_static_wait,
+            "animaciones": [str(animacion) for animacion in animaciones],
+            "duracion": float(self.duration),
+            "saltada": bool(self.renderer.skip_animations),
+            "fotogramas": self._fotogramas,
+            "segundos": segundos,
+            **self._medida,
+            "otros": max(segundos - sum(self._medida.values()), 0.0),
+            "mobjects": len(familia),
+            "puntos": int(sum(len(m.points) for m in familia)),
+        })
+
+    def guardar_perfil(self, directorio, total):
+        directorio.mkdir(parents=True, exist_ok=True)
+        escena = str(self)
+        escribir_json(directorio / f"{escena}.json", {
+            "escena": escena,
+            "resolucion": [config.pixel_width, config.pixel_height],
+            "frame_rate": config.frame_rate,
+            "segundos_totales": total,
+            "totales": {
+                parte: sum(entrada[parte] for entrada in self.perfil)
+                for parte in (*PARTES, "otros", "segundos")
+            },
+            "animaciones": self.perfil,
+        })
+
+        # Una linea por pila "escena;seccion;animacion;parte microsegundos"
+        lineas = []
+        for entrada in self.perfil:
+            nombre = f"{entrada['indice']:03} {entrada['tipo']} " + ", ".join(entrada["animaciones"])
+            pila = [escena, entrada["seccion"] or "-", nombre.replace(";", ",")]
+            for parte in (*PARTES, "otros"):
+                microsegundos = round(entrada[parte] * 1e6)
+                if microsegundos:
+                    lineas.append(f"{';'.join(pila + [parte])} {microsegundos}\n")
+        (directorio / f"{escena}.folded").write_text("".join(lineas), encoding="utf-8")
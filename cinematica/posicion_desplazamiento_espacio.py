@@ -1,16 +1,21 @@
 from manim import *
 import numpy as np
 
-class PosicionDespEspacio(MovingCameraScene, VectorScene):
+from escena import EscenaCinematica
+from graficas import sistema_referencia, trazar
+from morph import MorphPlanificado
+from tex import mathtex
+from trayectorias import Trayectoria
+from vectores import FlechaVector
 
-    def setup(self):
-        MovingCameraScene.setup(self)
-        VectorScene.setup(self)
+class PosicionDespEspacio(EscenaCinematica):
     
     def construct(self):
         
+        self.seccion("sistema de referencia")
+        
         # Creamos el sistema de referencia
-        sr = Axes(x_range=(0, 5), y_range=(0, 5)).add_coordinates()
+        sr = sistema_referencia(x_range=(0, 5), y_range=(0, 5))
         sr_text = Text('¡Sistema de referencia!', font_size=35).to_edge(DL).shift(DOWN)
 
         # Animamos SR y y su texto y movemos la camara
@@ -24,20 +29,22 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         self.play(self.camera.frame.animate.move_to((1, 0, 0)).set(width=sr.width*1.5))
         self.wait()
         
+        self.seccion("vectores de posicion")
+        
         # Creamos vectores de posicion
         # Origen del sistema de referencia
         sr_origin = sr.get_origin()
         
         # Puntos P, Q, texto y vectores
         p = Dot(sr.c2p(2, 3)) # !!!!
-        p_text = MathTex(r"P").next_to(p,RIGHT)
+        p_text = mathtex(r"P").next_to(p,RIGHT)
         v_p = Arrow(sr_origin, p.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        v_p_text = MathTex(r"\vec{r_{P}}").next_to(p, 2 * LEFT + 4 * DOWN)
+        v_p_text = mathtex(r"\vec{r_{P}}").next_to(p, 2 * LEFT + 4 * DOWN)
         
         q = Dot(sr.c2p(4, 2))
-        q_text = MathTex(r"Q").next_to(q,RIGHT)
+        q_text = mathtex(r"Q").next_to(q,RIGHT)
         v_q = Arrow(sr_origin, q.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        v_q_text = MathTex(r"\vec{r_{Q}}").next_to(q, 4 * LEFT + 4 * DOWN)
+        v_q_text = mathtex(r"\vec{r_{Q}}").next_to(q, 4 * LEFT + 4 * DOWN)
         
         # Animate
         self.play(Create(p), Write(p_text))
@@ -58,28 +65,30 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         self.play(self.camera.frame.animate.move_to((0, 0, 0)).set(width=sr.width*1.1))
         self.wait()
 
+        self.seccion("trayectorias")
+        
         # Trayectoria 1, grado 1
         def func1(x):
             return -0.5*x + 4
 
-        graph1 = sr.plot(func1, color=BLUE_B)
-        text_graph1 = MathTex(r"T_{1}", color=BLUE_B)
+        graph1 = trazar(sr, func1, color=BLUE_B)
+        text_graph1 = mathtex(r"T_{1}", color=BLUE_B)
         text_graph1.shift([5.75, -0.75, 0])
         
         # Trayectoria 2, grado 2
         def func2(x):
             return 0.5*x**2 - 3.5*x + 8
 
-        graph2 = sr.plot(func2, color=GREEN_B)
-        text_graph2 = MathTex(r"T_{2}", color=GREEN_B)
+        graph2 = trazar(sr, func2, color=GREEN_B)
+        text_graph2 = mathtex(r"T_{2}", color=GREEN_B)
         text_graph2.shift([5.75, 1.5, 0])
         
         # Trayectoria 3, seno
         def func3(x):
             return np.sin(np.pi/4*x) + 2
 
-        graph3 = sr.plot(func3, color=RED_B)
-        text_graph3 = MathTex(r"T_{3}", color=RED_B)
+        graph3 = trazar(sr, func3, color=RED_B)
+        text_graph3 = mathtex(r"T_{3}", color=RED_B)
         text_graph3.shift([5.75, -2, 0])
 
         # Representamos las trayectorias
@@ -97,14 +106,16 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         
         # Representamos un objeto moviendose en cada trayectoria
         # Trayectoria 1
+        # Las posiciones se precalculan para todos los fotogramas
         t1 = ValueTracker(0)
-        initial_point = [sr.coords_to_point(t1.get_value(), func1(t1.get_value()))]
+        tray1 = Trayectoria(sr, func1, 0, 5, run_time=5)
+        initial_point = tray1.punto(t1.get_value())
 
         dot1 = Dot(point=initial_point, color=BLUE, radius=0.1)
-        dot1.add_updater(lambda x: x.move_to(sr.c2p(t1.get_value(), func1(t1.get_value()))))
+        self.anadir_actualizador(dot1, tray1.actualizador(t1), t1)
         
-        v_1 = Arrow(sr_origin, dot1.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        v_1.add_updater(lambda x: x.put_start_and_end_on(sr_origin, dot1.get_center()))
+        v_1 = FlechaVector(sr_origin, dot1.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
+        self.anadir_actualizador(v_1, lambda x: x.put_start_and_end_on(sr_origin, dot1.get_center()), dot1)
         
         self.add(sr, dot1, v_1)
         self.play(t1.animate.set_value(5), run_time=5)
@@ -114,13 +125,14 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
 
         # Trayectoria 2
         t2 = ValueTracker(0)
-        initial_point = [sr.coords_to_point(t2.get_value(), func2(t2.get_value()))]
+        tray2 = Trayectoria(sr, func2, 0, 5, run_time=5)
+        initial_point = tray2.punto(t2.get_value())
 
         dot2 = Dot(point=initial_point, color=GREEN, radius=0.1)
-        dot2.add_updater(lambda x: x.move_to(sr.c2p(t2.get_value(), func2(t2.get_value()))))
+        self.anadir_actualizador(dot2, tray2.actualizador(t2), t2)
         
-        v_2 = Arrow(sr_origin, dot2.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        v_2.add_updater(lambda x: x.put_start_and_end_on(sr_origin, dot2.get_center()))
+        v_2 = FlechaVector(sr_origin, dot2.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
+        self.anadir_actualizador(v_2, lambda x: x.put_start_and_end_on(sr_origin, dot2.get_center()), dot2)
         
         self.add(sr, dot2, v_2)
         self.play(t2.animate.set_value(5), run_time=5)
@@ -130,13 +142,14 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         
         # Trayectoria 3
         t3 = ValueTracker(5)
-        initial_point = [sr.coords_to_point(t3.get_value(), func3(t3.get_value()))]
+        tray3 = Trayectoria(sr, func3, 5, 0, run_time=5)
+        initial_point = tray3.punto(t3.get_value())
 
         dot3 = Dot(point=initial_point, color=RED, radius=0.1)
-        dot3.add_updater(lambda x: x.move_to(sr.c2p(t3.get_value(), func3(t3.get_value()))))
+        self.anadir_actualizador(dot3, tray3.actualizador(t3), t3)
         
-        v_3 = Arrow(sr_origin, dot3.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        v_3.add_updater(lambda x: x.put_start_and_end_on(sr_origin, dot3.get_center()))
+        v_3 = FlechaVector(sr_origin, dot3.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
+        self.anadir_actualizador(v_3, lambda x: x.put_start_and_end_on(sr_origin, dot3.get_center()), dot3)
         
         self.add(sr, dot3, v_3)
         self.play(t3.animate.set_value(0), run_time=5)
@@ -144,10 +157,12 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         self.play(FadeOut(v_3))
         self.wait(2)
         
+        self.seccion("espacio recorrido")
+        
         # Marcamos el espacio recorrido en cada trayectoria
-        space1 = sr.plot(func1, x_range=[2, 4], color=YELLOW_C)
-        space2 = sr.plot(func2, x_range=[2, 4], color=YELLOW_C)
-        space3 = sr.plot(func3, x_range=[2, 4], color=YELLOW_C)
+        space1 = trazar(sr, func1, x_range=[2, 4], color=YELLOW_C)
+        space2 = trazar(sr, func2, x_range=[2, 4], color=YELLOW_C)
+        space3 = trazar(sr, func3, x_range=[2, 4], color=YELLOW_C)
         spaces = VGroup(space1, space2, space3)
         
         self.add(sr, spaces)
@@ -176,18 +191,18 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         # self.wait(2)
         
         # Nombramos los desplazamientos
-        space1 = sr.plot(func1, x_range=[2, 4], color=BLUE_C)
-        s1_text = MathTex(r"\Delta s_{1}", color=BLUE_C)
+        space1 = trazar(sr, func1, x_range=[2, 4], color=BLUE_C)
+        s1_text = mathtex(r"\Delta s_{1}", color=BLUE_C)
         s1_text.shift([2, -0.5, 0])
         space_text1 = VGroup(space1, s1_text)
         
-        space2 = sr.plot(func2, x_range=[2, 4], color=GREEN_C)
-        s2_text = MathTex(r"\Delta s_{2}", color=GREEN_C)
+        space2 = trazar(sr, func2, x_range=[2, 4], color=GREEN_C)
+        s2_text = mathtex(r"\Delta s_{2}", color=GREEN_C)
         s2_text.shift([2, -1, 0])
         space_text2 = VGroup(space2, s2_text)
         
-        space3 = sr.plot(func3, x_range=[2, 4], color=RED_C)
-        s3_text = MathTex(r"\Delta s_{3}", color=RED_C)
+        space3 = trazar(sr, func3, x_range=[2, 4], color=RED_C)
+        s3_text = mathtex(r"\Delta s_{3}", color=RED_C)
         s3_text.shift([2, 0.5, 0])
         space_text3 = VGroup(space3, s3_text)
         
@@ -203,13 +218,15 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         self.play(FadeOut(spaces))
         self.wait(2)
         
+        self.seccion("vector desplazamiento")
+        
         # Volvemos a mostrar los vectores de posicion 
         # ahora con subindice inicial y final
         r_i = Arrow(sr_origin, p.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        r_i_text = MathTex(r"\vec{r_{i}}").next_to(r_i.get_center())
+        r_i_text = mathtex(r"\vec{r_{i}}").next_to(r_i.get_center())
         
         r_f = Arrow(sr_origin, q.get_center(), buff=0, stroke_width=2.5, tip_length=0.2)
-        r_f_text = MathTex(r"\vec{r_{f}}").next_to(r_f.get_center(), DOWN * 0.5)
+        r_f_text = mathtex(r"\vec{r_{f}}").next_to(r_f.get_center(), DOWN * 0.5)
         
         self.play(Create(r_i), Write(r_i_text))
         self.wait()
@@ -222,10 +239,12 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         self.play(FadeOut(VGroup(p, p_text, q, q_text, r_i, r_i_text)))
         self.wait()
         
+        self.seccion("regla del paralelogramo")
+        
         # Mostramos regla del paralelogramo para la resta
         # Vectores
         menos_r_i = Arrow(sr_origin, sr.c2p(-2, -3), buff=0, stroke_width=2.5, tip_length=0.2)
-        menos_r_i_text = MathTex(r"\vec{-r_{i}}").next_to(menos_r_i.get_center())
+        menos_r_i_text = mathtex(r"\vec{-r_{i}}").next_to(menos_r_i.get_center())
         
         menos_r_i_prima = Line(sr.c2p(4, 2), sr.c2p(2, -1), buff=0, stroke_width=2.5, tip_length=0.2, color=RED)
         # menos_r_i_prima_text = MathTex(r"\vec{-r_{i}'}").next_to(menos_r_i_prima.get_center())
@@ -243,7 +262,7 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         
         # Vector desplazamiento
         desp = Arrow(sr_origin, sr.c2p(2, -1), buff=0, stroke_width=6, tip_length=0.3, color=BLUE)
-        desp_text = MathTex(r"\Delta \vec{r} = \vec{r_f} - \vec{r_i}", color=BLUE).next_to(desp.get_center(), 4 *DOWN + 7.5*RIGHT)
+        desp_text = mathtex(r"\Delta \vec{r} = \vec{r_f} - \vec{r_i}", color=BLUE).next_to(desp.get_center(), 4 *DOWN + 7.5*RIGHT)
         
         self.play(Create(desp), run_time=3)
         self.wait()
@@ -264,6 +283,6 @@ class PosicionDespEspacio(MovingCameraScene, VectorScene):
         desplazamiento.target.shift(r_i.get_vector())
         self.play(MoveToTarget(desplazamiento))
         self.wait(2)
-        desp_text_new = MathTex(r"\boldsymbol{\Delta \vec{r} = \vec{r_f} - \vec{r_i} = \vec{d}}", color=BLUE).next_to(desp.get_center(), 4 *DOWN + 7.5*RIGHT)
-        self.play(Transform(desp_text, desp_text_new))
+        desp_text_new = mathtex(r"\boldsymbol{\Delta \vec{r} = \vec{r_f} - \vec{r_i} = \vec{d}}", color=BLUE).next_to(desp.get_center(), 4 *DOWN + 7.5*RIGHT)
+        self.play(MorphPlanificado(desp_text, desp_text_new))
         self.wait(4)
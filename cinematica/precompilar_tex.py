@@ -0,0 +1,106 @@
+"""Precompilacion en paralelo de las formulas LaTeX de las escenas.
+
+Uso::
+
+    python cinematica/precompilar_tex.py
+
+Recorre el codigo de los modulos de ``cinematica`` buscando llamadas a
+``MathTex``/``mathtex`` con textos literales y las compila a la vez en varios
+procesos. Los SVG quedan en el directorio ``Tex`` de manim y los mobjects ya
+analizados en la cache de ``tex.py``, compartida por todas las escenas y
+todos los renders, de modo que ``construct`` nunca espera a LaTeX.
+"""
+import argparse
+import ast
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tex import clave_tex, ruta_tex, tex_cacheado
+
+DIRECTORIO = Path(__file__).resolve().parent
+
+# Funcion que aparece en el codigo -> clase de manim que construye
+FUNCIONES = {"MathTex": "MathTex", "mathtex": "MathTex", "Tex": "Tex"}
+
+
+def recopilar_tex(rutas):
+    """Diccionario ``clave -> (clase, textos, kwargs)`` con las formulas de los ficheros."""
+    import manim
+
+    entradas = {}
+    for ruta in rutas:
+        arbol = ast.parse(Path(ruta).read_text(encoding="utf-8"))
+        for nodo in ast.walk(arbol):
+            if not (
+                isinstance(nodo, ast.Call)
+                and isinstance(nodo.func, ast.Name)
+                and nodo.func.id in FUNCIONES
+                and nodo.args
+                and all(isinstance(a, ast.Constant) and isinstance(a.value, str) for a in nodo.args)
+            ):
+                continue
+            try:
+                # Los argumentos suelen ser constantes de manim (color=BLUE_B, ...)
+                kwargs = {
+                    k.arg: eval(compile(ast.Expression(k.value), str(ruta), "eval"), vars(manim))
+                    for k in nodo.keywords
+                }
+            except Exception:
+                # Dependen de variables de la escena: al menos compilamos el LaTeX
+                kwargs = {}
+            if None in kwargs:
+                kwargs = {}
+            clase = FUNCIONES[nodo.func.id]
+            textos = tuple(a.value for a in nodo.args)
+            entradas[clave_tex(clase, textos, kwargs)] = (clase, textos, kwargs)
+    return entradas
+
+
+def compilar(clase, textos, kwargs, opciones=None):
+    from manim import tempconfig
+
+    inicio = time.perf_counter()
+    with tempconfig(opciones or {}):
+        tex_cacheado(clase, *textos, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def precompilar(rutas, procesos=None, opciones=None):
+    """Compila en paralelo las formulas que aun no estan en la cache."""
+    pendientes = [
+        entrada for clave, entrada in recopilar_tex(rutas).items()
+        if not ruta_tex(clave).exists()
+    ]
+    if not pendientes:
+        return 0
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(procesos or os.cpu_count(), mp_context=contexto) as pool:
+        futuros = [
+            pool.submit(compilar, clase, textos, kwargs, opciones)
+            for clase, textos, kwargs in pendientes
+        ]
+        for futuro in futuros:
+            futuro.result()
+    return len(pendientes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ficheros", nargs="*", help="ficheros a recorrer (por defecto, todo cinematica)")
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--media_dir", default="media", help="directorio de salida de manim")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    rutas = args.ficheros or sorted(DIRECTORIO.glob("*.py"))
+    n = precompilar(rutas, args.procesos, {"media_dir": args.media_dir})
+    print(f"{n} formulas compiladas en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
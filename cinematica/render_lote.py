@@ -0,0 +1,168 @@
+"""Renderizado en lote de todas las escenas del directorio ``cinematica``.
+
+Uso::
+
+    python cinematica/render_lote.py -q l h
+
+Busca todas las subclases de ``Scene`` definidas en los modulos de este
+directorio y las renderiza en paralelo, cada una en su propio proceso, con
+tantos procesos como nucleos tenga la maquina. Al terminar escribe un resumen
+en JSON con el tiempo de cada render y el fichero generado.
+"""
+import argparse
+import importlib.util
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from precompilar_tex import precompilar
+
+DIRECTORIO = Path(__file__).resolve().parent
+
+# Mismas letras que la opcion -q de manim
+CALIDADES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def cargar_modulo(ruta, recargar=False):
+    """Importa un fichero de escenas igual que lo hace ``manim`` desde la linea de comandos."""
+    ruta = Path(ruta).resolve()
+    if str(ruta.parent) not in sys.path:
+        sys.path.insert(0, str(ruta.parent))
+    cargado = sys.modules.get(ruta.stem)
+    if not recargar and cargado is not None and getattr(cargado, "__file__", None) == str(ruta):
+        return cargado
+    spec = importlib.util.spec_from_file_location(ruta.stem, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[ruta.stem] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def escenas_de_modulo(modulo):
+    from manim import Scene
+
+    # Solo las escenas definidas en el propio modulo, con contenido y que no
+    # sean bases para otras escenas (como LeccionDeclarativa)
+    return [
+        clase for _, clase in inspect.getmembers(modulo, inspect.isclass)
+        if issubclass(clase, Scene)
+        and clase.__module__ == modulo.__name__
+        and clase.construct is not Scene.construct
+        and not vars(clase).get("abstracta", False)
+    ]
+
+
+def descubrir_escenas(directorio=DIRECTORIO):
+    """Lista de ``(ruta, nombre_escena)`` de todas las escenas del directorio."""
+    escenas = []
+    for ruta in sorted(Path(directorio).glob("*.py")):
+        for clase in escenas_de_modulo(cargar_modulo(ruta)):
+            escenas.append((str(ruta), clase.__name__))
+    return escenas
+
+
+def renderizar(ruta, escena, calidad, opciones=None):
+    """Renderiza una escena en el proceso actual y devuelve su entrada del resumen."""
+    from manim import config, tempconfig
+
+    inicio = time.perf_counter()
+    with tempconfig({"input_file": str(ruta), **(opciones or {})}):
+        config.quality = CALIDADES.get(calidad, calidad)
+        clase = getattr(cargar_modulo(ruta), escena)
+        instancia = clase()
+        instancia.render()
+        salida = getattr(instancia.renderer.file_writer, "movie_file_path", None)
+    return {
+        "modulo": Path(ruta).name,
+        "escena": escena,
+        "calidad": calidad,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "salida": str(salida) if salida else None,
+    }
+
+
+def renderizar_lote(trabajos, procesos=None, opciones=None):
+    """Renderiza en paralelo una lista de ``(ruta, escena, calidad)``."""
+    resultados = []
+    # spawn: cada proceso arranca limpio, sin heredar el estado de cairo
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(procesos or os.cpu_count(), mp_context=contexto) as pool:
+        futuros = {
+            pool.submit(renderizar, ruta, escena, calidad, opciones): (ruta, escena, calidad)
+            for ruta, escena, calidad in trabajos
+        }
+        for futuro in as_completed(futuros):
+            ruta, escena, calidad = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as error:
+                resultado = {
+                    "modulo": Path(ruta).name,
+                    "escena": escena,
+                    "calidad": calidad,
+                    "error": repr(error),
+                }
+            print(json.dumps(resultado, ensure_ascii=False))
+            resultados.append(resultado)
+    return resultados
+
+
+def ordenar_por_duracion(trabajos, resumen_anterior):
+    # Lanzamos primero las escenas que mas tardaron la ultima vez, asi el
+    # tiempo total se acerca al de la escena mas lenta
+    duraciones = {
+        (r["escena"], r["calidad"]): r.get("segundos", 0)
+        for r in resumen_anterior.get("renders", [])
+    }
+    return sorted(trabajos, key=lambda t: -duraciones.get((t[1], t[2]), float("inf")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("escenas", nargs="*", help="nombres de escena a renderizar (por defecto, todas)")
+    parser.add_argument("-q", "--calidad", nargs="+", default=["h"], help="calidades: l m h p k")
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos en paralelo (por defecto, uno por nucleo)")
+    parser.add_argument("--media_dir", default="media", help="directorio de salida de manim")
+    parser.add_argument("--resumen", default=None, help="fichero JSON del resumen (por defecto, <media_dir>/render_lote.json)")
+    parser.add_argument("--sin_precompilar", action="store_true", help="no precompilar las formulas LaTeX antes de renderizar")
+    args = parser.parse_args(argv)
+
+    escenas = descubrir_escenas()
+    if args.escenas:
+        escenas = [(ruta, nombre) for ruta, nombre in escenas if nombre in args.escenas]
+    trabajos = [(ruta, nombre, calidad) for ruta, nombre in escenas for calidad in args.calidad]
+
+    resumen_path = Path(args.resumen or Path(args.media_dir) / "render_lote.json")
+    anterior = json.loads(resumen_path.read_text()) if resumen_path.exists() else {}
+    trabajos = ordenar_por_duracion(trabajos, anterior)
+
+    inicio = time.perf_counter()
+    opciones = {"media_dir": args.media_dir, "progress_bar": "none"}
+    if not args.sin_precompilar:
+        # Todas las formulas de golpe y en paralelo antes de empezar
+        precompilar(sorted(DIRECTORIO.glob("*.py")), args.procesos, {"media_dir": args.media_dir})
+    resultados = renderizar_lote(trabajos, args.procesos, opciones)
+    resumen = {
+        "segundos_totales": round(time.perf_counter() - inicio, 3),
+        "procesos": args.procesos or os.cpu_count(),
+        "renders": sorted(resultados, key=lambda r: (r["modulo"], r["escena"], r["calidad"])),
+    }
+    resumen_path.parent.mkdir(parents=True, exist_ok=True)
+    resumen_path.write_text(json.dumps(resumen, indent=2, ensure_ascii=False))
+    print(f"Resumen escrito en {resumen_path}")
+    return 1 if any("error" in r for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Renderizado en paralelo de una sola escena larga, troceada por animaciones.
+
+Uso::
+
+    python cinematica/render_troceado.py cinematica/velocidades_media_instantanea.py Velocidades -n 8 -q h
+
+La escena se divide en ``n`` rangos consecutivos de llamadas a ``play``/``wait``
+y cada rango se renderiza en su propio proceso con las opciones
+``from_animation_number``/``upto_animation_number`` de manim. Las animaciones
+anteriores al rango se ejecutan sin rasterizar (igual que con ``manim -n``),
+de modo que el estado de la camara (``save_state``/``Restore``) y de los
+ValueTracker llega identico al inicio de cada trozo. Los trozos se unen
+despues con ``ffmpeg -c copy``, sin volver a codificar, asi que el video
+final coincide fotograma a fotograma con un render en serie.
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from render_lote import CALIDADES, cargar_modulo, renderizar
+
+
+def contar_animaciones(ruta, escena, calidad, opciones=None):
+    """Ejecuta la escena sin rasterizar y devuelve la duracion de cada animacion."""
+    from manim import config, tempconfig
+
+    duraciones = []
+    with tempconfig({"input_file": str(ruta), **(opciones or {}), "dry_run": True}):
+        config.quality = CALIDADES.get(calidad, calidad)
+        instancia = getattr(cargar_modulo(ruta), escena)(skip_animations=True)
+        play = instancia.renderer.play
+
+        def play_contando(scene, *args, **kwargs):
+            play(scene, *args, **kwargs)
+            duraciones.append(float(scene.duration))
+
+        instancia.renderer.play = play_contando
+        instancia.render()
+    return duraciones
+
+
+def repartir(duraciones, trozos):
+    """Divide las animaciones en rangos ``[inicio, fin)`` de duracion parecida."""
+    acumulado = [0.0]
+    for d in duraciones:
+        acumulado.append(acumulado[-1] + max(d, 1e-3))
+    total = acumulado[-1]
+    cortes = [0]
+    for k in range(1, trozos):
+        objetivo = total * k / trozos
+        corte = next(i for i, a in enumerate(acumulado) if a >= objetivo)
+        if cortes[-1] < corte < len(duraciones):
+            cortes.append(corte)
+    # Un primer rango de una sola animacion tendria upto_animation_number=0,
+    # que manim entiende como "sin limite": se une al siguiente
+    if len(cortes) > 1 and cortes[1] == 1:
+        del cortes[1]
+    cortes.append(len(duraciones))
+    return list(zip(cortes[:-1], cortes[1:]))
+
+
+def unir_videos(videos, salida):
+    """Concatena videos con el mismo formato sin recodificarlos."""
+    from manim import constants
+
+    salida = Path(salida)
+    lista = salida.with_suffix(".txt")
+    lista.write_text("".join(f"file 'file:{Path(v).resolve().as_posix()}'\n" for v in videos))
+    subprocess.run(
+        [
+            constants.FFMPEG_BIN, "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(lista),
+            "-c", "copy", "-an", str(salida),
+        ],
+        check=True,
+    )
+    lista.unlink()
+    return salida
+
+
+def renderizar_troceado(ruta, escena, calidad, trozos, procesos=None, opciones=None):
+    opciones = dict(opciones or {})
+    contexto = multiprocessing.get_context("spawn")
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(procesos or os.cpu_count(), mp_context=contexto) as pool:
+        duraciones = pool.submit(contar_animaciones, ruta, escena, calidad, opciones).result()
+        rangos = repartir(duraciones, trozos)
+        futuros = []
+        for i, (desde, hasta) in enumerate(rangos):
+            # Cada trozo tiene su propio directorio de ficheros parciales para
+            # que los procesos no se pisen la lista que le pasan a ffmpeg
+            opciones_trozo = {
+                **opciones,
+                "from_animation_number": desde,
+                "upto_animation_number": hasta - 1,
+                "output_file": f"{escena}_trozo{i:03}",
+                "partial_movie_dir": "{video_dir}/partial_movie_files/{scene_name}/" + f"trozo{i:03}",
+            }
+            futuros.append(pool.submit(renderizar, ruta, escena, calidad, opciones_trozo))
+        partes = [futuro.result() for futuro in futuros]
+
+    videos = [parte["salida"] for parte in partes]
+    salida = unir_videos(videos, Path(videos[0]).with_name(f"{escena}.mp4"))
+    for video in videos:
+        os.remove(video)
+    return {
+        "modulo": Path(ruta).name,
+        "escena": escena,
+        "calidad": calidad,
+        "trozos": [list(r) for r in rangos],
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "salida": str(salida),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fichero", help="fichero con la escena")
+    parser.add_argument("escena", help="nombre de la escena")
+    parser.add_argument("-n", "--trozos", type=int, default=os.cpu_count(), help="numero de trozos")
+    parser.add_argument("-q", "--calidad", default="h", help="calidad: l m h p k")
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--media_dir", default="media", help="directorio de salida de manim")
+    args = parser.parse_args(argv)
+
+    opciones = {"media_dir": args.media_dir, "progress_bar": "none"}
+    resultado = renderizar_troceado(
+        args.fichero, args.escena, args.calidad, args.trozos, args.procesos, opciones
+    )
+    print(resultado)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
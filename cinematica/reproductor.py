@@ -0,0 +1,304 @@
+"""Reproductor para clase que salta al instante entre las animaciones de una escena.
+
+Uso::
+
+    FISICANIMADA_PERFIL=perfiles manim -qh cinematica/velocidades_media_instantanea.py Velocidades
+    python cinematica/reproductor.py media/videos/velocidades_media_instantanea/1080p60/Velocidades.mp4 perfiles/Velocidades.json
+
+y abrir http://localhost:5000 en el navegador.
+
+Buscar dentro de un MP4 largo es lento e impreciso en los ordenadores del
+aula. El reproductor trocea el video en los ``play``/``wait`` de la escena:
+con el perfil del render (que da los fotogramas de cada animacion y su
+seccion) y los fotogramas clave que lista ffprobe construye un indice, que se
+guarda como ``<video>.indice.json`` y se reutiliza mientras el video no
+cambie. Cada tramo se extrae con ffmpeg empezando a decodificar en el
+fotograma clave anterior, de modo que el corte es exacto y rapido. Los tramos
+extraidos se guardan en una cache LRU en memoria y, al pedir uno, se preparan
+en segundo plano los siguientes.
+
+Con las flechas se avanza y retrocede un tramo, con la barra espaciadora se
+pausa y la lista de la izquierda salta al principio de cada seccion.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flask import Flask, Response, abort, jsonify
+from manim import constants
+import numpy as np
+
+from cache import escribir_json, leer_json
+
+# Tramos que se preparan por delante del que se esta viendo
+ADELANTO = 2
+# Memoria maxima de la cache de tramos
+MAX_BYTES = 256 * 1024 * 1024
+
+
+def ffprobe():
+    """ffprobe junto al ffmpeg que usa manim."""
+    ffmpeg = Path(constants.FFMPEG_BIN)
+    return str(ffmpeg.with_name(ffmpeg.name.replace("ffmpeg", "ffprobe")))
+
+
+def fotogramas_escritos(entrada, frame_rate):
+    """Fotogramas que manim escribe para una entrada del perfil, como ``CairoRenderer``."""
+    # Los perfiles antiguos no dicen si la espera era estatica
+    if entrada.get("estatica", entrada["tipo"] == "wait"):
+        # freeze_current_frame
+        return int(entrada["duracion"] / (1 / frame_rate))
+    # Un fotograma por cada instante de get_time_progression
+    return len(np.arange(0, entrada["duracion"], 1 / frame_rate))
+
+
+def fotogramas_clave(video):
+    """Instantes (en segundos) de los fotogramas clave de ``video``."""
+    salida = subprocess.run(
+        [
+            ffprobe(), "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey",
+            "-show_entries", "frame=best_effort_timestamp_time", "-of", "csv=p=0", str(video),
+        ],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return sorted(float(linea) for linea in salida.split() if linea.strip())
+
+
+def construir_indice(video, perfil):
+    """Tramos del video a partir del perfil del render, y fotogramas clave."""
+    datos = json.loads(Path(perfil).read_text(encoding="utf-8"))
+    frame_rate = datos["frame_rate"]
+    tramos = []
+    inicio = 0
+    for entrada in datos["animaciones"]:
+        # Las animaciones de secciones cacheadas no se rasterizan pero su
+        # video esta en el final
+        n = fotogramas_escritos(entrada, frame_rate) if entrada["saltada"] else entrada["fotogramas"]
+        if n == 0:
+            continue
+        tramos.append({
+            "indice": len(tramos),
+            "seccion": entrada["seccion"],
+            "tipo": entrada["tipo"],
+            "animaciones": entrada["animaciones"],
+            "inicio": inicio / frame_rate,
+            "fin": (inicio + n) / frame_rate,
+        })
+        inicio += n
+    return {
+        "video": str(Path(video).resolve()),
+        "modificado": Path(video).stat().st_mtime,
+        "escena": datos["escena"],
+        "tramos": tramos,
+        "fotogramas_clave": fotogramas_clave(video),
+    }
+
+
+def cargar_indice(video, perfil):
+    """Indice guardado junto al video, reconstruido si el video o el perfil son mas nuevos."""
+    video = Path(video)
+    ruta = video.with_name(f"{video.name}.indice.json")
+    indice = leer_json(ruta)
+    if (
+        indice.get("modificado") != video.stat().st_mtime
+        or ruta.stat().st_mtime < Path(perfil).stat().st_mtime
+    ):
+        indice = construir_indice(video, perfil)
+        escribir_json(ruta, indice)
+    return indice
+
+
+class Tramos:
+    """Extrae los tramos del indice y los guarda en una cache LRU."""
+
+    def __init__(self, indice, max_bytes=MAX_BYTES):
+        self.indice = indice
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.bytes = 0
+        self.pendientes = {}
+        self.cerrojo = threading.Lock()
+        self.hilos = ThreadPoolExecutor(max_workers=2)
+
+    def extraer(self, n):
+        tramo = self.indice["tramos"][n]
+        # Fotograma clave anterior al inicio: ffmpeg busca ahi directamente y
+        # solo decodifica desde ese punto hasta el inicio exacto
+        clave = max(
+            (t for t in self.indice["fotogramas_clave"] if t <= tramo["inicio"]), default=0.0
+        )
+        return subprocess.run(
+            [
+                constants.FFMPEG_BIN, "-v", "error", "-ss", f"{clave:.6f}", "-i", self.indice["video"],
+                "-ss", f"{tramo['inicio'] - clave:.6f}", "-t", f"{tramo['fin'] - tramo['inicio']:.6f}",
+                "-an", "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+                "-movflags", "frag_keyframe+empty_moov", "-f", "mp4", "-",
+            ],
+            capture_output=True, check=True,
+        ).stdout
+
+    def terminado(self, n, futuro):
+        with self.cerrojo:
+            self.pendientes.pop(n, None)
+            if futuro.exception() is not None or n in self.cache:
+                return
+            datos = futuro.result()
+            self.cache[n] = datos
+            self.bytes += len(datos)
+            while self.bytes > self.max_bytes and len(self.cache) > 1:
+                _, viejo = self.cache.popitem(last=False)
+                self.bytes -= len(viejo)
+
+    def preparar(self, n):
+        """Empieza a extraer el tramo ``n`` en segundo plano si no esta ya."""
+        with self.cerrojo:
+            if n in self.cache:
+                self.cache.move_to_end(n)
+                return None
+            if n in self.pendientes:
+                return self.pendientes[n]
+            futuro = self.hilos.submit(self.extraer, n)
+            self.pendientes[n] = futuro
+        # Fuera del cerrojo: si el futuro ya ha terminado, terminado() se
+        # ejecuta aqui mismo y necesita el cerrojo
+        futuro.add_done_callback(lambda f: self.terminado(n, f))
+        return futuro
+
+    def obtener(self, n):
+        futuro = self.preparar(n)
+        datos = futuro.result() if futuro is not None else None
+        with self.cerrojo:
+            datos = self.cache.get(n, datos)
+        if datos is None:
+            # Expulsado de la cache justo despues de comprobarlo
+            datos = self.extraer(n)
+        # Siguientes y anterior, para que avanzar y retroceder sean inmediatos
+        for vecino in (*range(n + 1, n + 1 + ADELANTO), n - 1):
+            if 0 <= vecino < len(self.indice["tramos"]):
+                self.preparar(vecino)
+        return datos
+
+
+PAGINA = """<!doctype html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{escena}</title>
+<style>
+  body {{ margin: 0; display: flex; height: 100vh; background: #111; color: #eee; font-family: sans-serif; }}
+  nav {{ width: 16em; overflow-y: auto; padding: 1em; }}
+  nav button {{ display: block; width: 100%; margin: 0.2em 0; text-align: left; }}
+  main {{ flex: 1; display: flex; flex-direction: column; align-items: center; justify-content: center; }}
+  video {{ max-width: 100%; max-height: 90vh; }}
+  .actual {{ background: #58c4dd; }}
+</style>
+</head>
+<body>
+<nav id="secciones"></nav>
+<main>
+  <video id="video" autoplay></video>
+  <p><button id="anterior">&larr;</button> <span id="estado"></span> <button id="siguiente">&rarr;</button>
+  <label><input type="checkbox" id="seguido"> seguido</label></p>
+</main>
+<script>
+const video = document.getElementById("video");
+const estado = document.getElementById("estado");
+const blobs = new Map();
+let tramos = [], actual = 0;
+
+function descargar(n) {{
+  if (!blobs.has(n)) {{
+    blobs.set(n, fetch("/tramo/" + n).then(r => r.blob()).then(b => URL.createObjectURL(b)));
+  }}
+  return blobs.get(n);
+}}
+
+async function ir(n) {{
+  if (n < 0 || n >= tramos.length) return;
+  actual = n;
+  const tramo = tramos[n];
+  estado.textContent = (n + 1) + "/" + tramos.length + " " + (tramo.seccion || "");
+  document.querySelectorAll("nav button").forEach(b => b.classList.toggle("actual", b.dataset.seccion === String(tramo.seccion)));
+  const url = await descargar(n);
+  if (n !== actual) return;
+  video.src = url;
+  video.play();
+  // Solo guardamos en el navegador los tramos cercanos
+  for (const [i, promesa] of blobs) {{
+    if (Math.abs(i - n) > 3) {{ promesa.then(URL.revokeObjectURL); blobs.delete(i); }}
+  }}
+  if (n + 1 < tramos.length) descargar(n + 1);
+}}
+
+video.addEventListener("ended", () => {{ if (document.getElementById("seguido").checked) ir(actual + 1); }});
+document.getElementById("anterior").onclick = () => ir(actual - 1);
+document.getElementById("siguiente").onclick = () => ir(actual + 1);
+document.addEventListener("keydown", e => {{
+  if (e.key === "ArrowRight") ir(actual + 1);
+  else if (e.key === "ArrowLeft") ir(actual - 1);
+  else if (e.key === " ") {{ video.paused ? video.play() : video.pause(); e.preventDefault(); }}
+}});
+
+fetch("/indice").then(r => r.json()).then(indice => {{
+  tramos = indice.tramos;
+  const nav = document.getElementById("secciones");
+  tramos.forEach((tramo, i) => {{
+    if (i > 0 && tramos[i - 1].seccion === tramo.seccion) return;
+    const boton = document.createElement("button");
+    boton.textContent = tramo.seccion || "inicio";
+    boton.dataset.seccion = tramo.seccion;
+    boton.onclick = () => ir(i);
+    nav.appendChild(boton);
+  }});
+  ir(0);
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def crear_app(indice):
+    app = Flask(__name__)
+    tramos = Tramos(indice)
+    publico = {clave: valor for clave, valor in indice.items() if clave != "fotogramas_clave"}
+
+    @app.route("/")
+    def pagina():
+        return PAGINA.format(escena=indice["escena"])
+
+    @app.route("/indice")
+    def ver_indice():
+        return jsonify(publico)
+
+    @app.route("/tramo/<int:n>")
+    def tramo(n):
+        if not 0 <= n < len(indice["tramos"]):
+            abort(404)
+        return Response(tramos.obtener(n), mimetype="video/mp4")
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video", help="video final de la escena")
+    parser.add_argument("perfil", help="perfil del render (FISICANIMADA_PERFIL), <Escena>.json")
+    parser.add_argument("--puerto", type=int, default=5000)
+    parser.add_argument("--solo_indice", action="store_true", help="construir el indice y salir")
+    args = parser.parse_args(argv)
+
+    indice = cargar_indice(args.video, args.perfil)
+    print(f"{len(indice['tramos'])} tramos, {len(indice['fotogramas_clave'])} fotogramas clave")
+    if not args.solo_indice:
+        crear_app(indice).run(port=args.puerto, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Varias resoluciones y formatos de video en una sola pasada de render.
+
+Se activa con la variable de entorno ``FISICANIMADA_SALIDAS``, una lista de
+``<alto>p.<formato>`` separada por comas::
+
+    FISICANIMADA_SALIDAS=720p.mp4,480p.mp4,480p.webm,360p.gif manim -qh cinematica/velocidades_media_instantanea.py Velocidades
+
+``construct``, los updaters y LaTeX se ejecutan una sola vez. Cada fotograma
+que manim manda a su ffmpeg se manda tambien a un ffmpeg por cada salida, que
+lo escala a su alto y lo codifica en paralelo con los demas. Los videos quedan
+junto al video principal, como ``Velocidades_480p.webm``.
+
+Para que ningun fotograma se salte, mientras hay salidas extra se desactivan la
+cache de animaciones de manim y la de secciones.
+"""
+import os
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+from manim import Scene, config, constants
+
+# Filtros y codecs de cada formato; {alto} es la altura de la salida
+FORMATOS = {
+    "mp4": ["-vf", "scale=-2:{alto}:flags=lanczos", "-vcodec", "libx264", "-pix_fmt", "yuv420p"],
+    "webm": [
+        "-vf", "scale=-2:{alto}:flags=lanczos",
+        "-vcodec", "libvpx-vp9", "-b:v", "0", "-crf", "32", "-pix_fmt", "yuv420p",
+    ],
+    "gif": [
+        "-vf", "fps=15,scale=-2:{alto}:flags=lanczos,split[a][b];[a]palettegen[p];[b][p]paletteuse",
+    ],
+}
+
+# Memoria maxima de fotogramas en espera en la cola de cada codificador
+MAX_BYTES_COLA = 64 * 1024 * 1024
+
+
+def salidas_pedidas():
+    """Lista de ``(alto, formato)`` pedidas en ``FISICANIMADA_SALIDAS``."""
+    salidas = []
+    for especificacion in os.environ.get("FISICANIMADA_SALIDAS", "").split(","):
+        especificacion = especificacion.strip()
+        if not especificacion:
+            continue
+        alto, formato = especificacion.split(".")
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de salida desconocido: {especificacion}")
+        salidas.append((int(alto.rstrip("p")), formato))
+    return salidas
+
+
+class Codificador:
+    """Proceso de ffmpeg que recibe fotogramas RGBA desde un hilo propio."""
+
+    def __init__(self, salida, alto, formato, ancho_origen, alto_origen, frame_rate):
+        self.salida = salida
+        filtros = [arg.format(alto=alto) for arg in FORMATOS[formato]]
+        self.proceso = subprocess.Popen(
+            [
+                constants.FFMPEG_BIN, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-s", f"{ancho_origen}x{alto_origen}",
+                "-pix_fmt", "rgba", "-r", str(frame_rate), "-i", "-",
+                "-an", *filtros, str(salida),
+            ],
+            stdin=subprocess.PIPE,
+        )
+        # Cola acotada en bytes: el render no espera a ffmpeg salvo que se
+        # quede atras, y la memoria no depende de la resolucion
+        self.cola = queue.Queue(maxsize=max(2, MAX_BYTES_COLA // (ancho_origen * alto_origen * 4)))
+        # Error al escribir en ffmpeg (por ejemplo, si ha terminado antes de tiempo)
+        self.error = None
+        self.hilo = threading.Thread(target=self.escribir, daemon=True)
+        self.hilo.start()
+
+    def escribir(self):
+        while True:
+            datos = self.cola.get()
+            if datos is None:
+                break
+            if self.error is not None:
+                # Seguimos vaciando la cola para que el render no se bloquee
+                continue
+            try:
+                self.proceso.stdin.write(datos)
+            except OSError as error:
+                self.error = error
+        try:
+            self.proceso.stdin.close()
+        except OSError as error:
+            self.error = self.error or error
+
+    def comprobar(self):
+        if self.error is not None or self.proceso.poll() is not None:
+            raise RuntimeError(f"ffmpeg fallo al escribir {self.salida}") from self.error
+
+    def enviar(self, datos):
+        """Pone un fotograma en la cola; falla si ffmpeg ya no puede recibirlo."""
+        self.comprobar()
+        self.cola.put(datos)
+
+    def cerrar(self):
+        # El hilo vacia la cola aunque ffmpeg haya fallado, asi que no se bloquea
+        self.cola.put(None)
+        self.hilo.join()
+        self.proceso.wait()
+        if self.error is not None or self.proceso.returncode:
+            raise RuntimeError(f"ffmpeg fallo al escribir {self.salida}") from self.error
+
+
+class SalidasMultiples(Scene):
+    """Mixin de escena que escribe las salidas de ``FISICANIMADA_SALIDAS``."""
+
+    def render(self, *args, **kwargs):
+        salidas = salidas_pedidas()
+        escritor = self.renderer.file_writer
+        if not salidas or not hasattr(escritor, "movie_file_path"):
+            return super().render(*args, **kwargs)
+
+        principal = Path(escritor.movie_file_path)
+        codificadores = [
+            Codificador(
+                principal.with_name(f"{principal.stem}_{alto}p.{formato}"), alto, formato,
+                config.pixel_width, config.pixel_height, config.frame_rate,
+            )
+            for alto, formato in salidas
+        ]
+        write_frame = escritor.write_frame
+
+        def write_frame_multiple(frame):
+            write_frame(frame)
+            datos = frame.tobytes()
+            for codificador in codificadores:
+                codificador.enviar(datos)
+
+        escritor.write_frame = write_frame_multiple
+        cache = config.disable_caching
+        config.disable_caching = True
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            config.disable_caching = cache
+            # Se cierran todos aunque alguno falle, y despues se avisa del fallo
+            errores = []
+            for codificador in codificadores:
+                try:
+                    codificador.cerrar()
+                except RuntimeError as error:
+                    errores.append(error)
+            if errores:
+                raise errores[0]
@@ -0,0 +1,131 @@
+"""Servidor de render que mantiene manim importado y vigila los ficheros de escenas.
+
+Uso::
+
+    python cinematica/servidor_render.py
+    python cinematica/servidor_render.py Velocidades -q l -p
+
+Importa manim, NumPy, SciPy y SymPy una sola vez y se queda vigilando el
+directorio ``cinematica`` con watchdog. Al arrancar, y cada vez que se guarda
+un fichero, vuelve a cargar solo ese modulo (y los modulos propios que lo
+importan) y renderiza en baja calidad sus escenas en el mismo proceso, sin
+volver a pagar el arranque de Python en cada iteracion.
+"""
+import argparse
+import queue
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Importaciones caras que queremos hacer una sola vez
+import manim  # noqa: F401
+import numpy  # noqa: F401
+import scipy.linalg  # noqa: F401
+import scipy.special  # noqa: F401
+import sympy  # noqa: F401
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from escena import fuentes_locales
+from render_lote import DIRECTORIO, cargar_modulo, escenas_de_modulo, renderizar
+
+# Tiempo que esperamos a que el editor termine de guardar antes de renderizar
+ESPERA = 0.3
+
+
+class Vigilante(FileSystemEventHandler):
+    """Mete en la cola los ficheros ``.py`` del directorio que cambian."""
+
+    def __init__(self, cola):
+        super().__init__()
+        self.cola = cola
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("created", "modified", "moved"):
+            return
+        ruta = Path(getattr(event, "dest_path", None) or event.src_path)
+        if ruta.suffix == ".py" and ruta.resolve().parent == DIRECTORIO:
+            self.cola.put(ruta.resolve())
+
+
+def modulos_locales():
+    """Modulos ya importados que son ficheros de este directorio."""
+    return {
+        nombre: modulo for nombre, modulo in list(sys.modules.items())
+        if nombre != "__main__" and getattr(modulo, "__file__", None)
+        and Path(modulo.__file__).resolve().parent == DIRECTORIO
+    }
+
+
+def afectados(cambiados):
+    """Ficheros de escenas que hay que recargar cuando cambian ``cambiados``."""
+    rutas = set()
+    for nombre, modulo in modulos_locales().items():
+        fichero = Path(modulo.__file__).resolve()
+        dependencias = {Path(f).resolve() for f in fuentes_locales(modulo)}
+        if fichero in cambiados or dependencias & cambiados:
+            # Sacamos el modulo para que la proxima importacion lea el fichero nuevo
+            del sys.modules[nombre]
+            rutas.add(fichero)
+    # Un fichero nuevo (o que fallo al importar) no esta todavia en sys.modules
+    return sorted(rutas | cambiados)
+
+
+def renderizar_cambios(cambiados, escenas, calidad, opciones):
+    for ruta in afectados(cambiados):
+        try:
+            clases = escenas_de_modulo(cargar_modulo(ruta, recargar=True))
+        except Exception:
+            traceback.print_exc()
+            continue
+        for clase in clases:
+            if escenas and clase.__name__ not in escenas:
+                continue
+            try:
+                resultado = renderizar(ruta, clase.__name__, calidad, opciones)
+                print(f"{clase.__name__}: {resultado['segundos']:.1f} s -> {resultado['salida']}")
+            except Exception:
+                traceback.print_exc()
+
+
+def servir(escenas=(), calidad="l", opciones=None):
+    cola = queue.Queue()
+    observador = Observer()
+    observador.schedule(Vigilante(cola), str(DIRECTORIO))
+    observador.start()
+
+    # Primer render con todo lo que haya en el directorio
+    for ruta in sorted(DIRECTORIO.glob("*.py")):
+        cola.put(ruta)
+    try:
+        while True:
+            cambiados = {cola.get()}
+            # Los editores suelen generar varios eventos al guardar
+            time.sleep(ESPERA)
+            while not cola.empty():
+                cambiados.add(cola.get())
+            renderizar_cambios(cambiados, escenas, calidad, opciones)
+            print("Esperando cambios...")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observador.stop()
+        observador.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("escenas", nargs="*", help="nombres de escena a renderizar (por defecto, todas)")
+    parser.add_argument("-q", "--calidad", default="l", help="calidad: l m h p k")
+    parser.add_argument("-p", "--preview", action="store_true", help="abrir el video al terminar cada render")
+    parser.add_argument("--media_dir", default="media", help="directorio de salida de manim")
+    args = parser.parse_args(argv)
+
+    opciones = {"media_dir": args.media_dir, "progress_bar": "none", "preview": args.preview}
+    servir(args.escenas, args.calidad, opciones)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
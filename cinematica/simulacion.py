@@ -0,0 +1,115 @@
+"""Simulacion de movimientos (MRU, MRUA, caida libre, tiros) antes de renderizar.
+
+En vez de avanzar un motor de fisica dentro de los updaters, ``simular``
+integra de una vez todos los cuerpos con NumPy, con paso fijo y el metodo de
+Verlet en velocidades, y guarda posiciones y velocidades en float32 en la
+almacen de disco (``almacen.py``). El paso no depende del frame rate, asi que la misma simulacion
+sirve para todas las calidades y todos los renders::
+
+    sim = simular(gravedad(), r0=[[0, 4], [0, 3]], v0=[[1, 0], [2, 1]], duracion=2)
+    tiempo = ValueTracker(0)
+    for tabla in sim.trayectorias(sr):
+        dot = Dot(tabla.punto(0))
+        self.anadir_actualizador(dot, tabla.actualizador(tiempo), tiempo)
+    self.play(tiempo.animate.set_value(2), run_time=2, rate_func=linear)
+
+Las coordenadas son las de los ejes ``sr`` (metros, segundos). Los cuerpos no
+interactuan entre si; para choques haria falta un motor como pymunk, que por
+ahora ninguna leccion necesita.
+"""
+from manim import config
+import numpy as np
+
+import almacen
+from cache import SinHuella, huella_funcion
+from trayectorias import Trayectoria
+
+# Pasos de integracion por segundo de simulacion
+PASOS_POR_SEGUNDO = 240
+
+
+def gravedad(g=9.8):
+    """Aceleracion constante hacia abajo."""
+    return np.array([0, -g])
+
+
+class Simulacion:
+    """Posiciones y velocidades de ``n`` cuerpos muestreadas en ``tiempos``.
+
+    ``posiciones`` y ``velocidades`` tienen forma ``(len(tiempos), n, 2)``.
+    """
+
+    def __init__(self, tiempos, posiciones, velocidades):
+        self.tiempos = tiempos
+        self.posiciones = posiciones
+        self.velocidades = velocidades
+
+    def muestrear(self, tabla, t):
+        """Valores de ``tabla`` interpolados linealmente en los instantes ``t``."""
+        paso = self.tiempos[1] - self.tiempos[0]
+        u = np.clip(np.asarray(t, dtype=float) / paso, 0, len(self.tiempos) - 1)
+        i = np.minimum(np.floor(u).astype(int), len(self.tiempos) - 2)
+        f = (u - i)[..., None, None]
+        return tabla[i] + f * (tabla[i + 1] - tabla[i])
+
+    def trayectorias(self, sr, frame_rate=None):
+        """Una ``Trayectoria`` por cuerpo, con el tiempo como parametro."""
+        if frame_rate is None:
+            frame_rate = config.frame_rate
+        duracion = float(self.tiempos[-1])
+        # Una muestra por fotograma, como Trayectoria
+        ts = np.linspace(0, duracion, max(int(np.ceil(duracion * frame_rate)) + 1, 2))
+        posiciones = self.muestrear(self.posiciones, ts)
+        velocidades = self.muestrear(self.velocidades, ts)
+        return [
+            Trayectoria.desde_muestras(sr, ts, posiciones[:, i], velocidades[:, i])
+            for i in range(posiciones.shape[1])
+        ]
+
+
+def _integrar(aceleracion, r0, v0, duracion):
+    n_pasos = max(int(np.ceil(duracion * PASOS_POR_SEGUNDO)), 1)
+    dt = duracion / n_pasos
+    r, v = r0.copy(), v0.copy()
+    posiciones = np.empty((n_pasos + 1, *r.shape), dtype=np.float32)
+    velocidades = np.empty_like(posiciones)
+    posiciones[0], velocidades[0] = r, v
+    a = aceleracion(0.0, r, v)
+    for paso in range(1, n_pasos + 1):
+        r = r + v * dt + a * (dt**2 / 2)
+        # Con rozamiento la aceleracion depende de la velocidad: usamos la
+        # prevista con la aceleracion anterior
+        a_nueva = aceleracion(paso * dt, r, v + a * dt)
+        v = v + (a + a_nueva) * (dt / 2)
+        a = a_nueva
+        posiciones[paso], velocidades[paso] = r, v
+    return np.stack([posiciones, velocidades])
+
+
+def simular(aceleracion, r0, v0, duracion):
+    """Integra el movimiento de los cuerpos con posiciones ``r0`` y velocidades ``v0``.
+
+    ``aceleracion`` es un vector constante (como ``gravedad()``) o una funcion
+    ``aceleracion(t, r, v)`` que recibe los arrays ``(n, 2)`` de todos los
+    cuerpos y devuelve sus aceleraciones. El resultado se guarda en el
+    almacen y se abre con ``mmap``.
+    """
+    r0 = np.atleast_2d(np.asarray(r0, dtype=float))
+    v0 = np.broadcast_to(np.asarray(v0, dtype=float), r0.shape).copy()
+    duracion = float(duracion)
+    if callable(aceleracion):
+        func = aceleracion
+        try:
+            clave = almacen.clave(
+                huella_funcion(aceleracion), r0.tolist(), v0.tolist(), duracion, PASOS_POR_SEGUNDO
+            )
+        except SinHuella:
+            clave = None
+    else:
+        constante = np.asarray(aceleracion, dtype=float)
+        func = lambda t, r, v: constante
+        clave = almacen.clave(constante.tolist(), r0.tolist(), v0.tolist(), duracion, PASOS_POR_SEGUNDO)
+    posiciones, velocidades = almacen.obtener(
+        "simulaciones", clave, lambda: _integrar(func, r0, v0, duracion)
+    )
+    return Simulacion(np.linspace(0, duracion, len(posiciones)), posiciones, velocidades)
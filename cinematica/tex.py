@@ -0,0 +1,144 @@
+"""Formulas LaTeX con cache persistente del SVG ya analizado.
+
+``mathtex(...)`` se usa igual que ``MathTex(...)``. La primera vez se compila
+con LaTeX y se analiza el SVG como siempre; el mobject resultante se guarda en
+disco y las siguientes veces (en esta escena, en otras escenas o en otro
+render) solo se carga y se copia. ``precompilar_tex.py`` rellena esta cache
+en paralelo antes de renderizar.
+
+En disco solo se guardan datos: la jerarquia de mobjects con sus atributos
+simples en JSON y los puntos y colores como arrays, en un ``.npz`` que se lee
+sin ``pickle``. Asi un directorio de cache compartido no puede ejecutar
+codigo al cargarse.
+"""
+import json
+import os
+import sys
+import tempfile
+import zipfile
+
+import manim
+from manim import Mobject, __version__, config
+from manim.utils.color import Color
+import numpy as np
+
+from cache import directorio_cache, huella
+
+# Prototipos ya cargados en este proceso
+_PROTOTIPOS = {}
+
+
+def clave_tex(clase, textos, kwargs):
+    plantilla = kwargs.get("tex_template") or config.tex_template
+    return huella(
+        __version__, clase, tuple(textos),
+        sorted((k, repr(v)) for k, v in kwargs.items() if k != "tex_template"),
+        getattr(plantilla, "body", repr(plantilla)),
+    )
+
+
+def ruta_tex(clave):
+    return directorio_cache("tex") / f"{clave}.npz"
+
+
+def _codificar(valor, arrays):
+    """Valor en forma JSON; los arrays se guardan aparte en ``arrays``."""
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray) and valor.dtype != object:
+        arrays.append(valor)
+        return {"array": len(arrays) - 1}
+    if isinstance(valor, Color):
+        return {"color": valor.hex_l}
+    if isinstance(valor, (list, tuple)):
+        return {type(valor).__name__: [_codificar(v, arrays) for v in valor]}
+    if isinstance(valor, dict):
+        return {"dict": [[_codificar(k, arrays), _codificar(v, arrays)] for k, v in valor.items()]}
+    raise TypeError(f"No se puede guardar un {type(valor).__name__}")
+
+
+def _decodificar(valor, arrays):
+    if not isinstance(valor, dict):
+        return valor
+    ((tipo, dato),) = valor.items()
+    if tipo == "array":
+        return arrays[dato]
+    if tipo == "color":
+        return Color(dato)
+    if tipo == "list":
+        return [_decodificar(v, arrays) for v in dato]
+    if tipo == "tuple":
+        return tuple(_decodificar(v, arrays) for v in dato)
+    if tipo == "dict":
+        return {_decodificar(k, arrays): _decodificar(v, arrays) for k, v in dato}
+    raise ValueError(f"Tipo desconocido en la cache de TeX: {tipo}")
+
+
+def _a_datos(mob, arrays):
+    atributos = dict(vars(mob))
+    atributos.pop("submobjects")
+    # La plantilla es parte de la clave; al cargar se pone la actual
+    plantilla = atributos.pop("tex_template", None) is not None
+    return {
+        "clase": [type(mob).__module__, type(mob).__qualname__],
+        "atributos": {k: _codificar(v, arrays) for k, v in atributos.items()},
+        "plantilla": plantilla,
+        "hijos": [_a_datos(hijo, arrays) for hijo in mob.submobjects],
+    }
+
+
+def _desde_datos(datos, arrays, plantilla):
+    modulo, nombre = datos["clase"]
+    # Solo clases de manim ya importadas: no se importa nada nuevo
+    clase = getattr(sys.modules.get(modulo) if modulo.startswith("manim.") else None, nombre, None)
+    if not (isinstance(clase, type) and issubclass(clase, Mobject)):
+        raise ValueError(f"Clase no permitida en la cache de TeX: {modulo}.{nombre}")
+    mob = clase.__new__(clase)
+    mob.__dict__.update({k: _decodificar(v, arrays) for k, v in datos["atributos"].items()})
+    if datos["plantilla"]:
+        mob.tex_template = plantilla
+    mob.submobjects = [_desde_datos(hijo, arrays, plantilla) for hijo in datos["hijos"]]
+    return mob
+
+
+def _guardar(ruta, prototipo):
+    arrays = []
+    try:
+        estructura = _a_datos(prototipo, arrays)
+    except TypeError:
+        # Algun atributo no es un dato simple: el prototipo solo queda en memoria
+        return
+    fd, temporal = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(
+            f, estructura=np.array(json.dumps(estructura)),
+            **{f"a{i}": array for i, array in enumerate(arrays)},
+        )
+    os.replace(temporal, ruta)
+
+
+def _cargar(ruta, plantilla):
+    with np.load(ruta, allow_pickle=False) as datos:
+        estructura = json.loads(str(datos["estructura"]))
+        arrays = [datos[f"a{i}"] for i in range(len(datos.files) - 1)]
+    return _desde_datos(estructura, arrays, plantilla)
+
+
+def tex_cacheado(clase, *textos, **kwargs):
+    clave = clave_tex(clase, textos, kwargs)
+    if clave not in _PROTOTIPOS:
+        ruta = ruta_tex(clave)
+        try:
+            prototipo = _cargar(ruta, kwargs.get("tex_template") or config.tex_template)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # No esta en cache (o es de otra version): lo construimos
+            prototipo = getattr(manim, clase)(*textos, **kwargs)
+            _guardar(ruta, prototipo)
+        _PROTOTIPOS[clave] = prototipo
+    return _PROTOTIPOS[clave].copy()
+
+
+def mathtex(*textos, **kwargs):
+    return tex_cacheado("MathTex", *textos, **kwargs)
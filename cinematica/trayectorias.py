@@ -0,0 +1,180 @@
+"""Trayectorias precalculadas para las escenas de cinematica.
+
+En lugar de llamar a la funcion de la trayectoria y a ``Axes.c2p`` en cada
+fotograma, evaluamos de una sola vez con NumPy todas las posiciones que va a
+ocupar el objeto y las animaciones solo consultan la tabla.
+
+Las trayectorias se pueden declarar con SymPy y compilarlas con
+``compilar_trayectoria``, que da la funcion y sus derivadas exactas.
+
+Las tablas se guardan en el almacen de disco (``almacen.py``): los procesos
+que renderizan a la vez escenas con la misma trayectoria, los mismos ejes y
+el mismo frame rate comparten una unica copia en memoria.
+"""
+import functools
+
+from manim import LinearBase, config, linear
+import numpy as np
+import sympy as sym
+
+import almacen
+from cache import SinHuella, huella, huella_funcion
+from movimiento import direccion, distancia_recorrida, velocidad_instantanea
+
+
+def evaluar(func, xs):
+    """Evalua ``func`` sobre el array ``xs`` de una sola vez."""
+    xs = np.asarray(xs, dtype=float)
+    try:
+        ys = np.asarray(func(xs), dtype=float)
+    except (TypeError, ValueError):
+        # La funcion no admite arrays (usa math, if, ...)
+        ys = np.vectorize(func, otypes=[float])(xs)
+    # Las funciones constantes (rectas horizontales) devuelven un escalar
+    return np.array(np.broadcast_to(ys, xs.shape))
+
+
+def c2p_lote(sr, xs, ys):
+    """Version vectorizada de ``sr.c2p`` para arrays de coordenadas."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if all(isinstance(eje.scaling, LinearBase) for eje in sr.get_axes()):
+        # Con ejes lineales c2p es una transformacion afin: basta con
+        # calcular el origen y los dos vectores de la base
+        origen = sr.c2p(0, 0)
+        e_x = sr.c2p(1, 0) - origen
+        e_y = sr.c2p(0, 1) - origen
+        return origen + np.multiply.outer(xs, e_x) + np.multiply.outer(ys, e_y)
+    puntos = [sr.c2p(x, y) for x, y in zip(xs.ravel(), ys.ravel())]
+    return np.array(puntos).reshape(xs.shape + (3,))
+
+
+def huella_ejes(sr):
+    """Huella de la transformacion de coordenadas de los ejes a la escena."""
+    (x0, x1), (y0, y1) = sr.x_range[:2], sr.y_range[:2]
+    esquinas = np.array([sr.c2p(x0, y0), sr.c2p(x1, y0), sr.c2p(x0, y1)])
+    escalas = [type(eje.scaling).__name__ for eje in (sr.x_axis, sr.y_axis)]
+    return huella(np.round(esquinas, 9).tolist(), escalas, [x0, x1, y0, y1])
+
+
+@functools.lru_cache(maxsize=None)
+def _lambdify(expr, simbolo):
+    return sym.lambdify(simbolo, expr, "numpy")
+
+
+def compilar_trayectoria(expr, simbolo):
+    """Compila ``y = expr`` a funciones NumPy vectorizadas ``(f, f', f'')``.
+
+    Para un objeto que recorre la curva con parametro ``x`` son la posicion,
+    la velocidad (direccion tangente) y la aceleracion.
+    """
+    return tuple(_lambdify(sym.diff(expr, simbolo, n), simbolo) for n in range(3))
+
+
+class Trayectoria:
+    """Tabla de posiciones de un objeto que recorre ``y = func(x)`` sobre ``sr``.
+
+    El parametro se muestrea en ``[inicio, fin]`` con un punto por fotograma
+    de una animacion de ``run_time`` segundos. Si se pasa la ``derivada`` de
+    la funcion tambien se precalculan los vectores tangentes (unitarios, en
+    coordenadas de la escena). Los ejes ``sr`` no deben moverse despues de
+    crear la trayectoria.
+
+    Un mobject sigue la trayectoria con el updater de ``actualizador``, que se
+    registra con ``anadir_actualizador`` como cualquier otro.
+    """
+
+    def __init__(self, sr, func, inicio, fin, run_time=1, frame_rate=None, derivada=None):
+        if frame_rate is None:
+            frame_rate = config.frame_rate
+        n = max(int(np.ceil(run_time * frame_rate)) + 1, 2)
+        self.inicio, self.fin, self.run_time = float(inicio), float(fin), run_time
+        self.parametros = np.linspace(min(inicio, fin), max(inicio, fin), n)
+        # Instante de cada muestra si el parametro avanza a ritmo constante
+        self.tiempos = np.linspace(0, run_time, n)
+        try:
+            clave = almacen.clave(huella_ejes(sr), huella_funcion(func), float(inicio), float(fin), n)
+        except SinHuella:
+            # La funcion captura valores que cambian de un proceso a otro:
+            # la tabla se calcula sin guardarla
+            clave = None
+        self.puntos = almacen.obtener(
+            "puntos", clave, lambda: c2p_lote(sr, self.parametros, evaluar(func, self.parametros))
+        )
+        self.tangentes = None
+        if derivada is not None:
+            try:
+                clave_tangentes = None if clave is None else almacen.clave(clave, huella_funcion(derivada))
+            except SinHuella:
+                clave_tangentes = None
+            # La parte lineal de c2p aplicada al vector (1, f'(x))
+            self.tangentes = almacen.obtener(
+                "tangentes",
+                clave_tangentes,
+                lambda: direccion(
+                    c2p_lote(sr, np.ones(n), evaluar(derivada, self.parametros))
+                    - c2p_lote(sr, 0, 0)
+                ),
+            )
+
+    @classmethod
+    def desde_muestras(cls, sr, parametros, posiciones, velocidades=None):
+        """Trayectoria con posiciones ``(x, y)`` ya calculadas (por ejemplo, simuladas).
+
+        ``parametros`` tienen que estar equiespaciados; con ``velocidades``
+        tambien se guardan las tangentes.
+        """
+        tabla = cls.__new__(cls)
+        tabla.parametros = np.asarray(parametros, dtype=float)
+        tabla.tiempos = tabla.parametros - tabla.parametros[0]
+        tabla.inicio, tabla.fin = tabla.parametros[0], tabla.parametros[-1]
+        tabla.run_time = tabla.tiempos[-1]
+        posiciones = np.asarray(posiciones, dtype=float)
+        tabla.puntos = c2p_lote(sr, posiciones[:, 0], posiciones[:, 1])
+        tabla.tangentes = None
+        if velocidades is not None:
+            velocidades = np.asarray(velocidades, dtype=float)
+            tabla.tangentes = direccion(
+                c2p_lote(sr, velocidades[:, 0], velocidades[:, 1]) - c2p_lote(sr, 0, 0)
+            )
+        return tabla
+
+    def interpolar(self, tabla, valor):
+        """Valor de ``tabla`` (una fila por muestra) para el valor del parametro.
+
+        Se interpola linealmente entre las dos muestras mas cercanas; fuera
+        del intervalo se devuelve la del extremo.
+        """
+        paso = self.parametros[1] - self.parametros[0]
+        u = (np.asarray(valor, dtype=float) - self.parametros[0]) / paso
+        i = np.clip(np.floor(u).astype(int), 0, len(self.parametros) - 2)
+        f = np.clip(u - i, 0, 1)[..., None]
+        return tabla[i] + f * (tabla[i + 1] - tabla[i])
+
+    def punto(self, valor):
+        """Posicion en la escena para el valor (o array de valores) del parametro."""
+        return self.interpolar(self.puntos, valor)
+
+    def tangente(self, valor):
+        """Vector tangente unitario para el valor (o array de valores) del parametro."""
+        return direccion(self.interpolar(self.tangentes, valor))
+
+    def velocidades(self, rate_func=linear):
+        """Velocidad en la escena en cada instante de ``tiempos``.
+
+        El parametro va de ``inicio`` a ``fin`` en ``run_time`` segundos con el
+        ritmo ``rate_func`` de la animacion del tracker. Por defecto es
+        constante, pero ``tracker.animate`` usa ``smooth`` si no se le indica
+        otro.
+        """
+        avance = evaluar(rate_func, self.tiempos / self.run_time)
+        posiciones = self.punto(self.inicio + avance * (self.fin - self.inicio))
+        return velocidad_instantanea(posiciones, self.tiempos)
+
+    def espacio_recorrido(self):
+        """Longitud en la escena del camino entre ``inicio`` y ``fin``."""
+        return distancia_recorrida(self.puntos)
+
+    def actualizador(self, tracker):
+        """Updater que coloca un mobject en la posicion marcada por ``tracker``."""
+        return lambda x: x.move_to(self.punto(tracker.get_value()))
@@ -0,0 +1,109 @@
+"""Flechas para vectores de posicion y velocidad que se mueven en cada fotograma.
+
+``Arrow.put_start_and_end_on`` quita la punta, escala y gira el cuerpo, vuelve
+a colocar la punta y recalcula los extremos en cada llamada. ``FlechaVector``
+guarda al crearse la geometria de la punta y del cuerpo y despues solo aplica
+una rotacion, un escalado del cuerpo y una traslacion, con el mismo grosor de
+trazo que usaria ``Arrow``. ``GrupoFlechas`` hace lo mismo con muchas flechas
+a la vez, con una sola operacion de NumPy para todas.
+
+Las flechas se giran en el plano XY, que es donde viven las escenas de
+cinematica.
+"""
+from manim import RIGHT, LEFT, Arrow, VGroup
+import numpy as np
+
+
+def _rotaciones(direcciones):
+    """Matrices de giro en el plano XY que llevan el eje X a cada direccion unitaria."""
+    c, s = direcciones[..., 0], direcciones[..., 1]
+    ceros, unos = np.zeros_like(c), np.ones_like(c)
+    return np.stack([
+        np.stack([c, -s, ceros], -1),
+        np.stack([s, c, ceros], -1),
+        np.stack([ceros, ceros, unos], -1),
+    ], -2)
+
+
+def _geometria(punta, largo_punta, fracciones, inicios, finales):
+    """Puntos del cuerpo y de la punta de flechas de ``inicios`` a ``finales``.
+
+    ``punta``, ``largo_punta`` y ``fracciones`` son la plantilla de cada
+    flecha (ver ``FlechaVector.guardar_plantilla``).
+    """
+    vectores = finales - inicios
+    largos = np.linalg.norm(vectores, axis=-1, keepdims=True)
+    u = vectores / np.where(largos == 0, 1, largos)
+    bases = finales - np.minimum(np.asarray(largo_punta)[..., None], largos) * u
+    cuerpos = inicios[..., None, :] + fracciones[..., :, None] * (bases - inicios)[..., None, :]
+    puntas = finales[..., None, :] + punta @ np.swapaxes(_rotaciones(u), -1, -2)
+    return cuerpos, puntas, largos[..., 0]
+
+
+class FlechaVector(Arrow):
+    """``Arrow`` que se recoloca con una transformacion afin de una plantilla fija.
+
+    La plantilla se toma al crear la flecha; si luego se cambia la punta (por
+    ejemplo con un ``Transform``) hay que llamar a ``guardar_plantilla``.
+    """
+
+    def __init__(self, start=LEFT, end=RIGHT, **kwargs):
+        kwargs.setdefault("buff", 0)
+        super().__init__(start, end, **kwargs)
+        self.guardar_plantilla()
+
+    def guardar_plantilla(self):
+        inicio, fin = self.get_start_and_end()
+        largo = np.linalg.norm(fin - inicio)
+        u = (fin - inicio) / largo
+        # Punta con el vertice en el origen y apuntando hacia +X
+        self._punta = (self.tip.points - fin) @ _rotaciones(u)
+        self._largo_punta = np.linalg.norm(fin - self.points[-1])
+        # Posicion de cada punto del cuerpo entre el inicio y la base de la punta
+        self._fracciones = (self.points - inicio) @ u / max(largo - self._largo_punta, 1e-12)
+        return self
+
+    def aplicar(self, cuerpo, punta, largo):
+        self.points = cuerpo
+        self.tip.points = punta
+        # Misma regla de grosor que Arrow.set_stroke_width_from_length
+        grosor = min(self.initial_stroke_width, self.max_stroke_width_to_length_ratio * largo)
+        if grosor != self.stroke_width:
+            self.set_stroke(width=grosor, family=False)
+        return self
+
+    def put_start_and_end_on(self, start, end):
+        start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+        if np.all(start == end):
+            return self
+        return self.aplicar(*_geometria(self._punta, self._largo_punta, self._fracciones, start, end))
+
+
+class GrupoFlechas(VGroup):
+    """Grupo de ``FlechaVector`` que se recolocan todas a la vez."""
+
+    def __init__(self, inicios, finales, **kwargs):
+        inicios = np.broadcast_to(np.asarray(inicios, dtype=float), np.shape(finales))
+        super().__init__(*[
+            FlechaVector(inicio, fin, **kwargs) for inicio, fin in zip(inicios, finales)
+        ])
+        self.guardar_plantilla()
+
+    def guardar_plantilla(self):
+        # Plantillas de todas las flechas apiladas para operar con ellas de golpe
+        self._punta = np.stack([f._punta for f in self.submobjects])
+        self._largo_punta = np.array([f._largo_punta for f in self.submobjects])
+        self._fracciones = np.stack([f._fracciones for f in self.submobjects])
+        return self
+
+    def colocar(self, inicios, finales):
+        """Recoloca la flecha ``i`` de ``inicios[i]`` a ``finales[i]``."""
+        inicios = np.broadcast_to(np.asarray(inicios, dtype=float), (len(self), 3))
+        finales = np.broadcast_to(np.asarray(finales, dtype=float), (len(self), 3))
+        cuerpos, puntas, largos = _geometria(
+            self._punta, self._largo_punta, self._fracciones, inicios, finales
+        )
+        for flecha, cuerpo, punta, largo in zip(self.submobjects, cuerpos, puntas, largos):
+            if largo > 0:
+                flecha.aplicar(cuerpo, punta, largo)
+        return self
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los modulos de cinematica se importan por su nombre, como hacen las escenas
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cinematica"))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import almacen
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISICANIMADA_CACHE", str(tmp_path))
+
+
+def test_obtener_guarda_y_reutiliza(tmp_path):
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        return np.arange(12.0).reshape(4, 3)
+
+    clave = almacen.clave("prueba", 1)
+    primero = almacen.obtener("tablas", clave, calcular)
+    segundo = almacen.obtener("tablas", clave, calcular)
+    assert len(llamadas) == 1
+    assert isinstance(segundo, np.memmap)
+    assert np.array_equal(primero, np.arange(12.0).reshape(4, 3))
+    assert np.array_equal(segundo, primero)
+    assert not segundo.flags.writeable
+
+
+def test_obtener_no_deja_temporales(tmp_path):
+    almacen.obtener("tablas", almacen.clave("a"), lambda: np.ones(3))
+    ficheros = [ruta.name for ruta in (tmp_path / "almacen" / "tablas").iterdir()]
+    assert ficheros == [f"{almacen.clave('a')}.npy"]
+
+
+def test_obtener_si_falla_el_calculo_no_guarda_nada(tmp_path):
+    def calcular():
+        raise RuntimeError("fallo")
+
+    with pytest.raises(RuntimeError):
+        almacen.obtener("tablas", almacen.clave("b"), calcular)
+    assert list((tmp_path / "almacen" / "tablas").iterdir()) == []
+
+
+def test_obtener_sin_clave_no_guarda(tmp_path):
+    datos = almacen.obtener("tablas", None, lambda: np.arange(3))
+    assert np.array_equal(datos, [0, 1, 2])
+    assert not (tmp_path / "almacen").exists()
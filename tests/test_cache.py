@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cache import SinHuella, huella_funcion
+
+CINEMATICA = Path(__file__).resolve().parent.parent / "cinematica"
+
+MODULO = """
+import functools
+import numpy as np
+
+
+def fabrica(k):
+    tabla = np.arange(5000.0) * k
+
+    def f(x):
+        return np.interp(x, tabla, tabla) + k
+
+    return f
+
+
+def g(x, escala=2.0):
+    return escala * x
+
+
+def compuesta(h):
+    return lambda x: h(x) + 1
+
+
+FUNCIONES = [fabrica(2), compuesta(fabrica(3)), functools.partial(g, escala=3.0), np.sin, g]
+"""
+
+
+def huellas_en_subproceso(directorio, semilla):
+    codigo = (
+        "import sys; import cache, trayectorias_prueba as m; "
+        "print([cache.huella_funcion(f) for f in m.FUNCIONES])"
+    )
+    entorno = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(CINEMATICA), str(directorio)]),
+        "PYTHONHASHSEED": str(semilla),
+    }
+    return subprocess.run(
+        [sys.executable, "-c", codigo], env=entorno, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_huella_estable_entre_procesos(tmp_path):
+    (tmp_path / "trayectorias_prueba.py").write_text(MODULO)
+    assert huellas_en_subproceso(tmp_path, 1) == huellas_en_subproceso(tmp_path, 2)
+
+
+def fabrica(tabla):
+    return lambda x: np.interp(x, tabla, tabla)
+
+
+def test_huella_arrays_grandes_distintos():
+    # Su repr es igual ("..."), pero el contenido no
+    a = np.arange(5000.0)
+    b = a.copy()
+    b[2500] = -1
+    assert repr(a) == repr(b)
+    assert huella_funcion(fabrica(a)) != huella_funcion(fabrica(b))
+    assert huella_funcion(fabrica(a)) == huella_funcion(fabrica(a.copy()))
+
+
+def test_huella_valores_por_defecto():
+    def f(x, k=1):
+        return k * x
+
+    def g(x, k=2):
+        return k * x
+
+    assert huella_funcion(f) != huella_funcion(g)
+
+
+def test_huella_funcion_capturada():
+    def compuesta(h):
+        return lambda x: h(x)
+
+    assert huella_funcion(compuesta(np.sin)) != huella_funcion(compuesta(np.cos))
+
+
+def test_huella_funcion_recursiva():
+    def fabrica_recursiva():
+        def f(n):
+            return 1 if n == 0 else n * f(n - 1)
+
+        return f
+
+    assert huella_funcion(fabrica_recursiva()) == huella_funcion(fabrica_recursiva())
+
+
+def test_sin_huella_con_direccion_en_memoria():
+    objeto = object()
+    with pytest.raises(SinHuella):
+        huella_funcion(lambda x: objeto)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from exportar_vectorial import TOLERANCIA, ajustar_afin, codificar_deltas
+
+FORMA = np.array([[0, 0], [1, 0], [1, 2], [0, 1], [0.5, 0.5]], dtype=float)
+
+
+def aplicar(afin, puntos):
+    a, b, c, d, tx, ty = afin
+    x, y = puntos[:, 0], puntos[:, 1]
+    return np.stack([a * x + b * y + tx, c * x + d * y + ty], axis=-1)
+
+
+def test_identidad():
+    assert ajustar_afin(FORMA, FORMA.copy()) == (1, 0, 0, 1, 0, 0)
+
+
+def test_traslacion():
+    afin = ajustar_afin(FORMA, FORMA + [2, -1])
+    assert np.allclose(afin, (1, 0, 0, 1, 2, -1))
+
+
+def test_giro_y_escala():
+    angulo, escala = 0.7, 1.5
+    c, s = np.cos(angulo) * escala, np.sin(angulo) * escala
+    destino = FORMA @ np.array([[c, s], [-s, c]]) + [0.3, 4]
+    afin = ajustar_afin(FORMA, destino)
+    assert afin is not None
+    assert np.allclose(aplicar(afin, FORMA), destino, atol=TOLERANCIA)
+    assert np.allclose(afin, (c, -s, s, c, 0.3, 4))
+
+
+def test_deformacion_no_afin():
+    destino = FORMA.copy()
+    destino[2] += [0.5, 0]
+    assert ajustar_afin(FORMA, destino) is None
+
+
+def test_deltas_reconstruyen_la_tabla():
+    rng = np.random.default_rng(1)
+    tabla = np.cumsum(rng.normal(size=(5000, 11)) * 0.01, axis=0) + 1000
+    deltas = codificar_deltas(tabla)
+    assert deltas.dtype == np.float32
+    # Como en el reproductor: sumas sucesivas en doble precision
+    reconstruida = np.cumsum(deltas.astype(np.float64), axis=0)
+    # El error no crece con el numero de filas
+    assert np.abs(reconstruida - tabla).max() < 1e-3
+    assert np.abs(reconstruida[-1] - tabla[-1]).max() < 1e-3
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Axes
+
+from graficas import TRAMOS_INICIALES, GraficaAdaptativa
+from trayectorias import c2p_lote
+
+
+def desviacion_maxima(grafica, sr, func):
+    """Mayor distancia entre las curvas de Bezier y la funcion en el mismo ``x``."""
+    curvas = grafica.points.reshape(-1, 4, 3)
+    s = np.linspace(0, 1, 33)[:, None, None]
+    bezier = (
+        (1 - s) ** 3 * curvas[:, 0] + 3 * (1 - s) ** 2 * s * curvas[:, 1]
+        + 3 * (1 - s) * s**2 * curvas[:, 2] + s**3 * curvas[:, 3]
+    )
+    # Con ejes lineales, x es una funcion afin de la coordenada X de la escena
+    origen = sr.c2p(0, 0)
+    escala_x = sr.c2p(1, 0)[0] - origen[0]
+    t0 = (curvas[:, 0, 0] - origen[0]) / escala_x
+    t1 = (curvas[:, 3, 0] - origen[0]) / escala_x
+    ts = t0 + s[..., 0] * (t1 - t0)
+    reales = c2p_lote(sr, ts, func(ts))
+    return np.linalg.norm(bezier - reales, axis=-1).max()
+
+
+@pytest.mark.parametrize("func", [
+    lambda x: np.sin(3 * x) + 2,
+    lambda x: x**2 / 5,
+    lambda x: 2 + np.exp(-x) * np.cos(6 * x),
+])
+def test_error_dentro_de_la_tolerancia(func):
+    sr = Axes(x_range=(0, 5), y_range=(0, 5))
+    grafica = GraficaAdaptativa(sr, func)
+    # El error se mide en tres puntos de cada tramo; entre ellos puede ser algo mayor
+    assert desviacion_maxima(grafica, sr, func) <= 2 * grafica.tolerancia
+
+
+def test_recta_sin_subdividir():
+    sr = Axes(x_range=(0, 5), y_range=(0, 5))
+    grafica = GraficaAdaptativa(sr, lambda x: 0.5 * x + 1)
+    assert len(grafica.points) == 4 * TRAMOS_INICIALES
+
+
+def test_menos_tolerancia_mas_tramos():
+    sr = Axes(x_range=(0, 5), y_range=(0, 5))
+    func = lambda x: np.sin(3 * x) + 2
+    normal = GraficaAdaptativa(sr, func)
+    con_zoom = GraficaAdaptativa(sr, func, zoom=8)
+    assert len(con_zoom.points) > len(normal.points)
+    assert desviacion_maxima(con_zoom, sr, func) <= 2 * con_zoom.tolerancia
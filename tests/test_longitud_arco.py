@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from longitud_arco import _integrar, longitud_arco
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISICANIMADA_CACHE", str(tmp_path))
+
+
+def test_integrar_polinomio():
+    assert _integrar(lambda xs: 3 * xs**2, 1, 4) == pytest.approx(63)
+
+
+def test_integrar_intervalo_invertido():
+    assert _integrar(lambda xs: 3 * xs**2, 4, 1) == pytest.approx(-63)
+
+
+def test_integrar_intervalo_vacio():
+    assert _integrar(np.cos, 2, 2) == 0.0
+
+
+def test_longitud_arco_recta():
+    assert longitud_arco(lambda x: 2 * x + 1, 0, 3) == pytest.approx(3 * np.sqrt(5))
+
+
+def test_longitud_arco_parabola():
+    analitica = np.sqrt(17) + np.arcsinh(4) / 4
+    assert longitud_arco(lambda x: x**2, 0, 2, lambda x: 2 * x) == pytest.approx(analitica)
+    assert longitud_arco(lambda x: x**2, 0, 2) == pytest.approx(analitica, rel=1e-8)
+
+
+def test_longitud_arco_invertida_y_vacia():
+    def func(x):
+        return np.sin(x)
+
+    assert longitud_arco(func, 4, 1) == pytest.approx(longitud_arco(func, 1, 4))
+    assert longitud_arco(func, 4, 1) > 0
+    assert longitud_arco(func, 2, 2) == 0.0
+
+
+def test_longitud_arco_depende_de_la_derivada():
+    def func(x):
+        return x**2
+
+    correcta = longitud_arco(func, 0, 1, lambda x: 2 * x)
+    # Una derivada distinta no puede devolver la longitud guardada con la otra
+    assert longitud_arco(func, 0, 1, lambda x: 0 * x) == pytest.approx(1)
+    assert correcta == pytest.approx(np.sqrt(5) / 2 + np.arcsinh(2) / 4)
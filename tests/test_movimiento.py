@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from movimiento import (
+    con_modulo, desplazamiento, direccion, distancia_recorrida, modulo, rapidez_media, trasladar,
+    velocidad_instantanea, velocidad_media,
+)
+
+
+def test_desplazamiento():
+    assert np.allclose(desplazamiento([1, 2, 0], [4, 6, 0]), [3, 4, 0])
+
+
+def test_desplazamiento_en_lote():
+    inicio = np.zeros((5, 3))
+    final = np.arange(15).reshape(5, 3)
+    assert np.allclose(desplazamiento(inicio, final), final)
+
+
+def test_modulo():
+    assert modulo([3, 4, 0]) == pytest.approx(5)
+    assert np.allclose(modulo([[3, 4, 0], [0, 0, 2]]), [5, 2])
+
+
+def test_direccion():
+    assert np.allclose(direccion([3, 4, 0]), [0.6, 0.8, 0])
+
+
+def test_direccion_vector_nulo():
+    resultado = direccion([[0, 0, 0], [0, 2, 0]])
+    assert np.allclose(resultado, [[0, 0, 0], [0, 1, 0]])
+    assert np.all(np.isfinite(resultado))
+
+
+def test_velocidad_media():
+    assert np.allclose(velocidad_media([1, 1, 0], [4, 5, 0], 2), [1.5, 2, 0])
+    assert np.allclose(velocidad_media([[0, 0, 0]] * 2, [[2, 0, 0], [0, 6, 0]], [1, 3]), [[2, 0, 0], [0, 2, 0]])
+
+
+def test_distancia_recorrida_segmento():
+    puntos = np.linspace([0, 0, 0], [3, 4, 0], 11)
+    assert distancia_recorrida(puntos) == pytest.approx(5)
+
+
+def test_distancia_recorrida_circunferencia():
+    angulos = np.linspace(0, 2 * np.pi, 2001)
+    puntos = np.stack([2 * np.cos(angulos), 2 * np.sin(angulos), 0 * angulos], axis=-1)
+    assert distancia_recorrida(puntos) == pytest.approx(4 * np.pi, rel=1e-5)
+
+
+def test_distancia_recorrida_parabola():
+    # Longitud de y = x**2 entre 0 y 2
+    x = np.linspace(0, 2, 20001)
+    puntos = np.stack([x, x**2, 0 * x], axis=-1)
+    analitica = np.sqrt(17) + np.arcsinh(4) / 4
+    assert distancia_recorrida(puntos) == pytest.approx(analitica, rel=1e-6)
+
+
+def test_velocidad_instantanea_uniformemente_acelerado():
+    # x = t**2, y = 3 t: v = (2 t, 3), tambien en los extremos
+    t = np.linspace(0, 2, 21)
+    puntos = np.stack([t**2, 3 * t, 0 * t], axis=-1)
+    velocidades = velocidad_instantanea(puntos, t)
+    assert np.allclose(velocidades, np.stack([2 * t, 3 + 0 * t, 0 * t], axis=-1))
+    assert velocidades[0, 0] == pytest.approx(0)
+
+
+def test_velocidad_instantanea_circular():
+    t = np.linspace(0, np.pi, 401)
+    puntos = np.stack([np.cos(t), np.sin(t), 0 * t], axis=-1)
+    esperada = np.stack([-np.sin(t), np.cos(t), 0 * t], axis=-1)
+    assert np.allclose(velocidad_instantanea(puntos, t), esperada, atol=1e-4)
+
+
+def test_velocidad_instantanea_dos_muestras():
+    velocidades = velocidad_instantanea([[0, 0, 0], [2, 1, 0]], [0, 0.5])
+    assert np.allclose(velocidades, [[4, 2, 0], [4, 2, 0]])
+
+
+def test_con_modulo():
+    assert np.allclose(con_modulo([3, 4, 0], 10), [6, 8, 0])
+    assert np.allclose(con_modulo([[1, 0, 0], [0, 0, 0]], [2, 5]), [[2, 0, 0], [0, 0, 0]])
+
+
+def test_trasladar():
+    inicio, fin = trasladar([1, 1, 0], np.array([2, -1, 0]))
+    assert np.allclose(inicio, [1, 1, 0])
+    assert np.allclose(fin, [3, 0, 0])
+
+
+def test_rapidez_media_ida_y_vuelta():
+    # Ida y vuelta: la velocidad media es nula pero la rapidez media no
+    puntos = np.array([[0, 0, 0], [2, 0, 0], [0, 0, 0]])
+    assert rapidez_media(puntos, 4) == pytest.approx(1)
+    assert np.allclose(velocidad_media(puntos[0], puntos[-1], 4), 0)
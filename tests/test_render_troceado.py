@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from render_troceado import repartir
+
+
+def test_repartir_cubre_todas_las_animaciones():
+    rangos = repartir([1, 2, 1, 3, 1, 1, 2], 3)
+    assert rangos[0][0] == 0
+    assert rangos[-1][1] == 7
+    assert all(fin == inicio for (_, fin), (inicio, _) in zip(rangos, rangos[1:]))
+
+
+def test_repartir_primer_rango_con_mas_de_una_animacion():
+    # upto_animation_number=0 seria "sin limite" en manim
+    rangos = repartir([5, 1, 1, 1, 1, 1], 4)
+    assert rangos == [(0, 4), (4, 6)]
+    assert rangos[0][1] - 1 > 0
+
+
+def test_repartir_una_sola_animacion():
+    assert repartir([5], 4) == [(0, 1)]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from simulacion import gravedad, simular
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISICANIMADA_CACHE", str(tmp_path))
+
+
+def test_tiro_parabolico():
+    sim = simular(gravedad(), r0=[[0, 1]], v0=[[3, 4]], duracion=0.8)
+    t = sim.tiempos[:, None]
+    # Con aceleracion constante Verlet es exacto (salvo el redondeo a float32)
+    assert np.allclose(sim.posiciones[:, 0], np.hstack([3 * t, 1 + 4 * t - 4.9 * t**2]), atol=1e-5)
+    assert np.allclose(sim.velocidades[:, 0], np.hstack([3 + 0 * t, 4 - 9.8 * t]), atol=1e-5)
+
+
+def test_varios_cuerpos_a_la_vez():
+    sim = simular(gravedad(), r0=[[0, 0], [1, 2]], v0=[[1, 1], [0, 0]], duracion=0.5)
+    assert sim.posiciones.shape == (len(sim.tiempos), 2, 2)
+    # Caida libre del segundo cuerpo
+    assert sim.posiciones[-1, 1] == pytest.approx([1, 2 - 4.9 * 0.25], abs=1e-5)
+
+
+def test_energia_oscilador_armonico():
+    k = 4.0
+    sim = simular(lambda t, r, v: -k * r, r0=[[1, 0]], v0=[[0, 0.5]], duracion=10)
+    r = sim.posiciones[:, 0].astype(float)
+    v = sim.velocidades[:, 0].astype(float)
+    energia = 0.5 * (v**2).sum(axis=-1) + 0.5 * k * (r**2).sum(axis=-1)
+    assert np.abs(energia / energia[0] - 1).max() < 1e-4
+    # Solucion exacta: x = cos(2 t), y = 0.25 sin(2 t)
+    t = sim.tiempos
+    assert np.allclose(r, np.stack([np.cos(2 * t), 0.25 * np.sin(2 * t)], axis=-1), atol=1e-3)
+
+
+def test_rozamiento_lineal():
+    c = 0.5
+    sim = simular(lambda t, r, v: gravedad() - c * v, r0=[[0, 0]], v0=[[2, 3]], duracion=2)
+    t = sim.tiempos
+    x = 2 / c * (1 - np.exp(-c * t))
+    vy = (3 + 9.8 / c) * np.exp(-c * t) - 9.8 / c
+    assert np.allclose(sim.posiciones[:, 0, 0], x, atol=1e-4)
+    assert np.allclose(sim.velocidades[:, 0, 1], vy, atol=1e-4)
+
+
+def test_muestrear_interpola_linealmente():
+    sim = simular(gravedad(), r0=[[0, 0]], v0=[[1, 0]], duracion=1)
+    paso = sim.tiempos[1]
+    medio = sim.muestrear(sim.posiciones, paso / 2)
+    assert np.allclose(medio, (sim.posiciones[0] + sim.posiciones[1]) / 2)
+    # Fuera del intervalo se queda en los extremos
+    assert np.allclose(sim.muestrear(sim.posiciones, 5), sim.posiciones[-1])
+
+
+def test_se_reutiliza_del_almacen():
+    primera = simular(gravedad(), r0=[[0, 0]], v0=[[1, 2]], duracion=1)
+    segunda = simular(gravedad(), r0=[[0, 0]], v0=[[1, 2]], duracion=1)
+    assert isinstance(segunda.posiciones, np.memmap)
+    assert np.array_equal(primera.posiciones, segunda.posiciones)
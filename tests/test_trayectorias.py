@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import smooth
+
+from trayectorias import Trayectoria
+
+
+class Ejes:
+    """Ejes lineales minimos: x -> 2x - 1, y -> y + 1."""
+
+    x_range = y_range = (0, 5, 1)
+
+    class x_axis:
+        from manim import LinearBase
+        scaling = LinearBase()
+
+    y_axis = x_axis
+
+    def get_axes(self):
+        return [self.x_axis, self.y_axis]
+
+    def c2p(self, x, y):
+        return np.array([2 * x - 1, y + 1, 0.0])
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISICANIMADA_CACHE", str(tmp_path))
+
+
+def test_velocidades_a_ritmo_constante():
+    tray = Trayectoria(Ejes(), lambda x: 3 * x, 0, 2, run_time=4, frame_rate=15)
+    # x avanza 0.5 por segundo: en la escena (1, 1.5)
+    assert np.allclose(tray.velocidades()[:, :2], [1, 1.5])
+
+
+def test_velocidades_hacia_atras():
+    tray = Trayectoria(Ejes(), lambda x: 3 * x, 2, 0, run_time=4, frame_rate=15)
+    assert np.allclose(tray.velocidades()[:, :2], [-1, -1.5])
+
+
+def test_velocidades_con_rate_func():
+    tray = Trayectoria(Ejes(), lambda x: 0 * x, 0, 2, run_time=4, frame_rate=60)
+    v = tray.velocidades(smooth)[:, 0]
+    # Arranca y frena despacio, y el desplazamiento total no cambia
+    assert v[0] < 0.1 and v[-1] < 0.1
+    assert v.max() > 1.5
+    assert np.trapz(v, tray.tiempos) == pytest.approx(4, abs=1e-3)
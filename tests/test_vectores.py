@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from vectores import _geometria
+
+# Plantilla: punta triangular con el vertice en el origen apuntando a +X
+PUNTA = np.array([[0, 0, 0], [-0.3, 0.1, 0], [-0.3, -0.1, 0]], dtype=float)
+LARGO_PUNTA = 0.3
+FRACCIONES = np.array([0, 1 / 3, 2 / 3, 1])
+
+
+def test_flecha_horizontal():
+    cuerpo, punta, largo = _geometria(PUNTA, LARGO_PUNTA, FRACCIONES, np.zeros(3), np.array([2.0, 0, 0]))
+    assert largo == pytest.approx(2)
+    # El cuerpo va del inicio a la base de la punta
+    assert np.allclose(cuerpo[:, 0], FRACCIONES * 1.7)
+    assert np.allclose(cuerpo[:, 1:], 0)
+    assert np.allclose(punta, PUNTA + [2, 0, 0])
+
+
+def test_flecha_girada():
+    inicio, fin = np.array([1.0, 1, 0]), np.array([1.0, 3, 0])
+    cuerpo, punta, largo = _geometria(PUNTA, LARGO_PUNTA, FRACCIONES, inicio, fin)
+    assert largo == pytest.approx(2)
+    assert np.allclose(cuerpo[0], inicio)
+    assert np.allclose(cuerpo[-1], fin - [0, 0.3, 0])
+    # Giro de 90 grados: (x, y) -> (-y, x)
+    girada = np.stack([-PUNTA[:, 1], PUNTA[:, 0], PUNTA[:, 2]], axis=-1)
+    assert np.allclose(punta, girada + fin)
+
+
+def test_flecha_mas_corta_que_la_punta():
+    cuerpo, punta, largo = _geometria(PUNTA, LARGO_PUNTA, FRACCIONES, np.zeros(3), np.array([0.1, 0, 0]))
+    assert largo == pytest.approx(0.1)
+    assert np.allclose(cuerpo, 0)
+
+
+def test_flecha_nula():
+    cuerpo, punta, largo = _geometria(PUNTA, LARGO_PUNTA, FRACCIONES, np.ones(3), np.ones(3))
+    assert largo == 0
+    assert np.all(np.isfinite(cuerpo)) and np.all(np.isfinite(punta))
+
+
+def test_lote_igual_que_una_a_una():
+    rng = np.random.default_rng(0)
+    inicios = rng.normal(size=(5, 3)) * [1, 1, 0]
+    finales = rng.normal(size=(5, 3)) * [1, 1, 0]
+    cuerpos, puntas, largos = _geometria(
+        np.stack([PUNTA] * 5), np.full(5, LARGO_PUNTA), np.stack([FRACCIONES] * 5), inicios, finales
+    )
+    for i in range(5):
+        cuerpo, punta, largo = _geometria(PUNTA, LARGO_PUNTA, FRACCIONES, inicios[i], finales[i])
+        assert np.allclose(cuerpos[i], cuerpo)
+        assert np.allclose(puntas[i], punta)
+        assert largos[i] == pytest.approx(largo)